@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AuthConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "authentication"
+
+    def ready(self):
+        import authentication.signals  # noqa: F401
@@ -1,5 +1,13 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from authentication.models import ClaimsUser
 
 
 class EmailBackend(ModelBackend):
@@ -15,3 +23,37 @@ class EmailBackend(ModelBackend):
         except UserModel.DoesNotExist:
             return None
         return None
+
+
+class RevocationCache:
+    timeout = settings.JWT_REVOCATION_CACHE_TIMEOUT
+
+    def get_key(*, user_id):
+        return f"authentication:active:{user_id}"
+
+    def is_active(*, user_id):
+        key = RevocationCache.get_key(user_id=user_id)
+        is_active = cache.get(key)
+        if is_active is None:
+            is_active = (
+                get_user_model()
+                .objects.filter(pk=user_id)
+                .values_list("is_active", flat=True)
+                .first()
+            ) or False
+            cache.set(key, is_active, RevocationCache.timeout)
+        return is_active
+
+    def invalidate(*, user_id):
+        cache.delete(RevocationCache.get_key(user_id=user_id))
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = ClaimsUser(validated_token)
+        if user.is_active is False or not RevocationCache.is_active(user_id=user.pk):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -1,7 +1,9 @@
 from django.contrib.auth.base_user import BaseUserManager
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.models import TokenUser
 
 
 class CustomUserManager(BaseUserManager):
@@ -27,3 +29,20 @@ class CustomUser(AbstractUser):
 
     def __str__(self):
         return self.email
+
+
+class ClaimsUser(TokenUser):
+    @cached_property
+    def is_active(self):
+        return self.token.get("is_active")
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    @cached_property
+    def instance(self):
+        return CustomUser.objects.get(pk=self.pk)
+
+    def get_username(self):
+        return self.email
@@ -8,6 +8,13 @@ from rest_framework_simplejwt.serializers import (
 class TokenObtainPairSerializer(JwtTokenObtainPairSerializer):
     username_field = get_user_model().USERNAME_FIELD
 
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["email"] = user.email
+        token["is_active"] = user.is_active
+        return token
+
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,84 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from authentication.models import CustomUser
+from core.models import Company
+
+
+class ClaimsAuthenticationTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user_data = {"email": "testuser@gmail.com", "password": "testpassword"}
+        self.user = CustomUser.objects.create_user(**self.user_data)
+        self.company = Company.objects.create(user=self.user, name="company")
+        response = self.client.post(reverse("token-obtain"), self.user_data)
+        self.access_token = response.data["access"]
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID=self.company.uuid,
+        )
+
+    def get_user_queries(self, *, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        user_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if "authentication_customuser" in query["sql"]
+        ]
+        return response, user_queries
+
+    def test_token_embeds_user_claims(self):
+        token = AccessToken(self.access_token)
+        self.assertEqual(token["email"], self.user.email)
+        self.assertTrue(token["is_active"])
+        self.assertNotIn("companies", token)
+
+    def test_authenticated_requests_do_not_load_the_user(self):
+        url = reverse("brand-list")
+        response, user_queries = self.get_user_queries(url=url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(user_queries), 1)
+
+        response, user_queries = self.get_user_queries(url=url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries, [])
+
+    def test_user_detail_loads_the_full_user(self):
+        response = self.client.get(reverse("user_detail"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], self.user.email)
+
+    def test_deactivated_user_is_rejected(self):
+        url = reverse("brand-list")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_rejected(self):
+        self.user.delete()
+        response = self.client.get(reverse("user_detail"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tokens_issued_without_claims_are_accepted(self):
+        access_token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {access_token}",
+            HTTP_X_COMPANY_UUID=self.company.uuid,
+        )
+
+        response = self.client.get(reverse("brand-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(reverse("brand-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -1,8 +1,69 @@
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Q
+from django.db.models.functions import Greatest
 from django_filters import rest_framework as filters
-from core.models import Brand, Category, Partner, Product, UnitOfMeasure
+from core.models import (
+    Brand,
+    Category,
+    Partner,
+    Product,
+    ProductVariant,
+    UnitOfMeasure,
+    VariantValue,
+)
+
+
+class SearchFilter(filters.CharFilter):
+    def __init__(self, *args, search_fields, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.search_fields = search_fields
+
+    def get_related_ids(self, *, qs, relation, field, value):
+        related_model = qs.model._meta.get_field(relation).related_model
+        related_queryset = related_model.objects.filter(
+            **{f"{field}__icontains": value}
+        )
+        company = getattr(getattr(self.parent, "request", None), "company", None)
+        if company is not None:
+            related_queryset = related_queryset.filter(company=company)
+        return list(related_queryset.values_list("id", flat=True))
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+
+        condition = Q()
+        for field in self.search_fields:
+            relation, _, related_field = field.rpartition("__")
+            if relation:
+                # Matching across the join keeps the planner off the trigram
+                # indexes, so resolve the related ids up front instead.
+                condition |= Q(
+                    **{
+                        f"{relation}_id__in": self.get_related_ids(
+                            qs=qs, relation=relation, field=related_field, value=value
+                        )
+                    }
+                )
+            else:
+                condition |= Q(**{f"{field}__icontains": value})
+
+        similarities = [
+            TrigramWordSimilarity(value, field) for field in self.search_fields
+        ]
+        search_rank = (
+            Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+        )
+
+        return (
+            qs.filter(condition)
+            .annotate(search_rank=search_rank)
+            .order_by("-search_rank", "-id")
+        )
 
 
 class PartnerFilter(filters.FilterSet):
+    q = SearchFilter(search_fields=["name", "email", "tax_id"])
     name = filters.CharFilter(field_name="name", lookup_expr="icontains")
     email = filters.CharFilter(field_name="email", lookup_expr="icontains")
     tax_id = filters.CharFilter(field_name="tax_id", lookup_expr="icontains")
@@ -37,6 +98,7 @@ class UnitOfMeasureFilter(filters.FilterSet):
 
 
 class ProductFilter(filters.FilterSet):
+    q = SearchFilter(search_fields=["name", "sku", "barcode", "brand__name"])
     name = filters.CharFilter(field_name="name", lookup_expr="icontains")
     brand_name = filters.CharFilter(field_name="brand__name", lookup_expr="icontains")
     unit_of_measure_name = filters.CharFilter(
@@ -46,3 +108,21 @@ class ProductFilter(filters.FilterSet):
     class Meta:
         model = Product
         fields = ["name"]
+
+
+class ProductVariantFilter(filters.FilterSet):
+    option_value = filters.CharFilter(method="filter_option_value")
+    sku = filters.CharFilter(field_name="sku")
+    barcode = filters.CharFilter(field_name="barcode")
+    min_price = filters.NumberFilter(field_name="price", lookup_expr="gte")
+    max_price = filters.NumberFilter(field_name="price", lookup_expr="lte")
+
+    class Meta:
+        model = ProductVariant
+        fields = ["sku", "barcode"]
+
+    def filter_option_value(self, queryset, name, value):
+        variant_value_ids = VariantValue.objects.filter(
+            product_id__in=queryset.values("product_id"), value__iexact=value
+        ).values_list("id", flat=True)
+        return queryset.filter(variant_value_ids__overlap=list(variant_value_ids))
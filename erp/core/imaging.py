@@ -0,0 +1,40 @@
+import os
+
+from PIL import Image as PilImage
+from PIL import ImageOps
+
+DERIVATIVE_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp"}
+
+
+def get_derivative_name(*, name, derivative, file_format):
+    stem = os.path.splitext(os.path.basename(name))[0]
+    extension = DERIVATIVE_EXTENSIONS[file_format]
+    return f"images/derivatives/{stem}_{derivative}.{extension}"
+
+
+def render_derivatives(*, media_root, name, derivatives):
+    derivative_names = {}
+    with PilImage.open(os.path.join(media_root, name)) as source:
+        largest_size = max(
+            (tuple(options["size"]) for options in derivatives.values()),
+            key=lambda size: size[0] * size[1],
+        )
+        source.draft("RGB", largest_size)
+        source = ImageOps.exif_transpose(source)
+
+        for derivative, options in derivatives.items():
+            file_format = options["format"]
+            image = source.copy()
+            image.thumbnail(tuple(options["size"]), PilImage.Resampling.LANCZOS)
+            if file_format == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+
+            derivative_name = get_derivative_name(
+                name=name, derivative=derivative, file_format=file_format
+            )
+            path = os.path.join(media_root, derivative_name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            image.save(path, file_format, quality=options.get("quality", 85))
+            derivative_names[derivative] = derivative_name
+
+    return derivative_names
@@ -0,0 +1,64 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.services import ImageGarbageCollectorService
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Image.in_use and delete orphaned images, abandoned chunked "
+        "uploads and untracked media files older than a grace period."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument(
+            "--batch-size", type=int, default=ImageGarbageCollectorService.batch_size
+        )
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=24,
+            help="Only collect rows and files older than this many hours.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            help="Keep running and repeat the collection every INTERVAL seconds.",
+        )
+
+    def handle(self, *args, **options):
+        image_garbage_collector_service = ImageGarbageCollectorService()
+        image_garbage_collector_service.batch_size = options["batch_size"]
+        image_garbage_collector_service.dry_run = options["dry_run"]
+
+        while True:
+            self.collect(
+                image_garbage_collector_service=image_garbage_collector_service,
+                before=timezone.now() - timedelta(hours=options["grace_hours"]),
+            )
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
+
+    def collect(self, *, image_garbage_collector_service, before):
+        verb = "Would delete" if image_garbage_collector_service.dry_run else "Deleted"
+
+        refreshed = image_garbage_collector_service.refresh_in_use()
+        self.stdout.write(f"Refreshed in_use on {refreshed} images.")
+
+        collections = [
+            ("orphaned images", image_garbage_collector_service.collect_images),
+            ("abandoned uploads", image_garbage_collector_service.collect_uploads),
+            ("untracked media files", image_garbage_collector_service.collect_files),
+        ]
+        for label, collect in collections:
+            total = 0
+            for count in collect(before=before):
+                total += count
+                if count:
+                    self.stdout.write(f"{verb} {count} {label} ({total} so far).")
+            self.stdout.write(self.style.SUCCESS(f"{verb} {total} {label}."))
@@ -0,0 +1,51 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Company
+from core.serializers import ProductImportSerializer
+from core.services import ProductImportService
+
+
+class Command(BaseCommand):
+    help = "Bulk import products for a company from a CSV or NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("company_uuid")
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=ProductImportService.file_formats,
+            help="File format, inferred from the file extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=ProductImportService.batch_size
+        )
+
+    def handle(self, *args, **options):
+        try:
+            company = Company.objects.get(uuid=options["company_uuid"])
+        except (Company.DoesNotExist, ValidationError):
+            raise CommandError(f"Company '{options['company_uuid']}' does not exist.")
+
+        file_format = options["file_format"] or options["path"].rsplit(".", 1)[-1]
+        if file_format not in ProductImportService.file_formats:
+            raise CommandError(f"Unsupported import format '{file_format}'.")
+
+        product_import_service = ProductImportService()
+        product_import_service.batch_size = options["batch_size"]
+        with open(options["path"], encoding="utf-8", newline="") as file:
+            result = product_import_service.import_rows(
+                company=company,
+                serializer=ProductImportSerializer(),
+                rows=ProductImportService.read_rows(file=file, file_format=file_format),
+            )
+
+        for error in result["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result['created']} products "
+                f"({len(result['errors'])} rows with errors)."
+            )
+        )
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.13 on 2026-10-18 08:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_alter_brand_company_alter_category_company_and_more'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='variantoption',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('product', 'name'), name='unique_variant_option_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='variantvalue',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('option', 'value'), name='unique_variant_value'),
+        ),
+    ]
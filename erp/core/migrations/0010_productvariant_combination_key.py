@@ -0,0 +1,65 @@
+# Generated by Django 4.2.13 on 2026-10-18 09:09
+
+import hashlib
+from itertools import product as itertools_product
+
+from django.db import migrations, models
+
+
+def set_combination_keys(apps, schema_editor):
+    ProductVariant = apps.get_model("core", "ProductVariant")
+    VariantValue = apps.get_model("core", "VariantValue")
+
+    product_ids = (
+        ProductVariant.objects.filter(
+            deleted_at__isnull=True, combination_key__isnull=True
+        )
+        .values_list("product_id", flat=True)
+        .distinct()
+    )
+    for product_id in product_ids:
+        option_values = {}
+        for variant_value in (
+            VariantValue.objects.filter(product_id=product_id, deleted_at__isnull=True)
+            .select_related("option")
+            .order_by("option_id", "id")
+        ):
+            option_values.setdefault(variant_value.option, []).append(variant_value)
+
+        option_names = " ".join([option.name for option in option_values])
+        combination_keys = {}
+        for combination in itertools_product(*option_values.values()):
+            if not combination:
+                continue
+            name = option_names + " - " + " ".join([value.value for value in combination])
+            value_ids = ",".join(sorted(str(value.id) for value in combination))
+            combination_keys[name] = hashlib.md5(value_ids.encode()).hexdigest()
+
+        product_variants = ProductVariant.objects.filter(
+            product_id=product_id, deleted_at__isnull=True, combination_key__isnull=True
+        )
+        for product_variant in product_variants:
+            product_variant.combination_key = combination_keys.pop(
+                product_variant.name, None
+            )
+        ProductVariant.objects.bulk_update(product_variants, ["combination_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_brand_brand_name_trgm_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productvariant',
+            name='combination_key',
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True, verbose_name='Combination Key'),
+        ),
+        migrations.RunPython(set_combination_keys, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='productvariant',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('product', 'combination_key'), name='unique_product_variant_combination'),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.13 on 2026-10-18 09:13
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import hashlib
+from itertools import product as itertools_product
+
+from django.db import migrations, models
+
+
+def set_variant_value_ids(apps, schema_editor):
+    ProductVariant = apps.get_model("core", "ProductVariant")
+    VariantValue = apps.get_model("core", "VariantValue")
+
+    product_ids = (
+        ProductVariant.objects.filter(
+            deleted_at__isnull=True, combination_key__isnull=False
+        )
+        .values_list("product_id", flat=True)
+        .distinct()
+    )
+    for product_id in product_ids:
+        option_values = {}
+        for variant_value_id, option_id in (
+            VariantValue.objects.filter(product_id=product_id, deleted_at__isnull=True)
+            .order_by("option_id", "id")
+            .values_list("id", "option_id")
+        ):
+            option_values.setdefault(option_id, []).append(variant_value_id)
+
+        value_ids = {}
+        for combination in itertools_product(*option_values.values()):
+            if not combination:
+                continue
+            combination_key = hashlib.md5(
+                ",".join(sorted(str(value_id) for value_id in combination)).encode()
+            ).hexdigest()
+            value_ids[combination_key] = sorted(combination)
+
+        product_variants = ProductVariant.objects.filter(
+            product_id=product_id, deleted_at__isnull=True, combination_key__isnull=False
+        )
+        for product_variant in product_variants:
+            product_variant.variant_value_ids = value_ids.get(
+                product_variant.combination_key, []
+            )
+        ProductVariant.objects.bulk_update(product_variants, ["variant_value_ids"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_productvariant_combination_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productvariant',
+            name='variant_value_ids',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), blank=True, default=list, editable=False, size=None, verbose_name='Variant Value IDs'),
+        ),
+        migrations.RunPython(set_variant_value_ids, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='productvariant',
+            index=models.Index(fields=['product', 'sku'], name='variant_product_sku_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productvariant',
+            index=models.Index(fields=['product', 'barcode'], name='variant_product_barcode_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productvariant',
+            index=models.Index(fields=['product', 'price', 'id'], name='variant_product_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productvariant',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['variant_value_ids'], name='variant_value_ids_gin_idx'),
+        ),
+    ]
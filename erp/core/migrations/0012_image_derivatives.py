@@ -0,0 +1,18 @@
+# Generated by Django 4.2.13 on 2026-10-18 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_productvariant_variant_value_ids_and_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='derivatives',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Derivatives'),
+        ),
+    ]
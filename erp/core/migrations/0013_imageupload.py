@@ -0,0 +1,36 @@
+# Generated by Django 4.2.13 on 2026-10-18 09:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django_extensions.db.fields
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('restored_at', models.DateTimeField(blank=True, null=True)),
+                ('uuid', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, unique=True, verbose_name='UUID')),
+                ('filename', models.CharField(max_length=255, verbose_name='Filename')),
+                ('size', models.BigIntegerField(verbose_name='Size')),
+                ('offset', models.BigIntegerField(default=0, verbose_name='Offset')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='image_uploads', to='core.company', verbose_name='Company')),
+                ('image', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='image_uploads', to='core.image', verbose_name='Image')),
+            ],
+            options={
+                'get_latest_by': 'modified',
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.13 on 2026-10-18 09:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_imageupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, verbose_name='Content Hash'),
+        ),
+        migrations.AddConstraint(
+            model_name='image',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True)), fields=('company', 'content_hash'), name='unique_image_content_hash'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.13 on 2026-10-18 10:40
+
+from django.db import migrations, models
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+
+
+def bump_modified(apps, schema_editor):
+    for model_name in [
+        "Brand",
+        "Category",
+        "ImageUpload",
+        "Partner",
+        "Product",
+        "ProductVariant",
+        "UnitOfMeasure",
+    ]:
+        model = apps.get_model("core", model_name)
+        model._base_manager.filter(
+            Q(deleted_at__gt=F("modified")) | Q(restored_at__gt=F("modified"))
+        ).update(modified=Greatest("modified", "deleted_at", "restored_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_image_content_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(bump_modified, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='brand',
+            index=models.Index(fields=['company', 'modified'], name='brand_company_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['company', 'modified'], name='category_company_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='imageupload',
+            index=models.Index(fields=['company', 'modified'], name='upload_company_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partner',
+            index=models.Index(fields=['company', 'modified'], name='partner_company_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['company', 'modified'], name='product_company_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productvariant',
+            index=models.Index(fields=['company', 'modified'], name='variant_company_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='unitofmeasure',
+            index=models.Index(fields=['company', 'modified'], name='uom_company_modified_idx'),
+        ),
+    ]
@@ -1,29 +1,209 @@
-from django.shortcuts import get_object_or_404
+import csv
+import hashlib
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import F, Max, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Greatest
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils import timezone
+from django.utils.http import http_date, quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, permissions, serializers, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 
-from core.pagination import BasePagination
+from core.pagination import (
+    BaseCursorPagination,
+    BasePagination,
+    CountCache,
+    CountStrategy,
+)
 from core.models import Company
-from core.services import UtilService
+from core.services import CompanyService, UtilService
 
 
 class BaseModelViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = BasePagination
+    count_strategy = CountStrategy.EXACT
+    cursor_pagination_class = BaseCursorPagination
+    cursor_ordering_fields = ["id", "name", "created", "modified"]
     lookup_field = "uuid"
     filter_backends = [DjangoFilterBackend]
+    allow_bulk = False
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if (
+                self.cursor_pagination_class
+                and self.cursor_pagination_class.is_requested(self.request)
+            ):
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
 
     def get_company(self):
-        company_uuid = self.request.headers.get("X-Company-UUID")
-        company = get_object_or_404(Company, uuid=company_uuid, user=self.request.user)
-        return company
+        if not hasattr(self.request, "company"):
+            self.request.company = CompanyService.get_for_user(
+                user=self.request.user,
+                company_uuid=self.request.headers.get("X-Company-UUID"),
+            )
+        return self.request.company
 
     def get_queryset(self):
         company = self.get_company()
         return self.queryset.filter(company=company)
 
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method == "GET" and any(
+            BaseSerializer.get_sparse_fieldset(self.request)
+        ):
+            queryset = self.prune_queryset(
+                queryset=queryset, serializer=self.get_serializer()
+            )
+        return queryset
+
+    def prune_queryset(self, *, queryset, serializer):
+        serializer_fields = serializer.fields
+        prefetch_names = set(serializer_fields)
+        for field_name, lookups in getattr(serializer, "field_prefetches", {}).items():
+            if field_name in serializer_fields:
+                prefetch_names.update(lookups)
+
+        model_fields = {"id"}
+        for field in serializer_fields.values():
+            if field.write_only or field.source == "*":
+                continue
+            try:
+                model_field = queryset.model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return queryset
+            if not model_field.concrete:
+                return queryset
+            model_fields.add(model_field.name)
+
+        select_related = queryset.query.select_related
+        if isinstance(select_related, dict):
+            queryset = queryset.select_related(None)
+            related_fields = [name for name in select_related if name in model_fields]
+            if related_fields:
+                queryset = queryset.select_related(*related_fields)
+
+        prefetch_lookups = []
+        for lookup in queryset._prefetch_related_lookups:
+            prefetch_to = lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+            if prefetch_to.split("__")[0] in prefetch_names:
+                prefetch_lookups.append(lookup)
+        queryset = queryset.prefetch_related(None).prefetch_related(*prefetch_lookups)
+
+        return queryset.only(*model_fields)
+
+    def get_related_fields(self, *, queryset):
+        select_related = queryset.query.select_related
+        if not isinstance(select_related, dict):
+            return []
+        return [queryset.model._meta.get_field(name) for name in select_related]
+
+    def get_instance_last_modified(self, *, queryset):
+        modified_fields = ["modified"] + [
+            f"{field.name}__modified"
+            for field in self.get_related_fields(queryset=queryset)
+        ]
+        if len(modified_fields) > 1:
+            last_modified = Greatest(*modified_fields)
+        else:
+            last_modified = F("modified")
+        return (
+            queryset.order_by()
+            .annotate(last_modified=last_modified)
+            .values_list("last_modified", flat=True)
+            .first()
+        )
+
+    def get_list_last_modified(self, *, queryset):
+        company = self.get_company()
+        models = [queryset.model] + [
+            field.related_model for field in self.get_related_fields(queryset=queryset)
+        ]
+        last_modified = {
+            f"{model._meta.model_name}_last_modified": Subquery(
+                model.global_objects.filter(company=OuterRef("pk"))
+                .order_by()
+                .values("company")
+                .annotate(last_modified=Max("modified"))
+                .values("last_modified")
+            )
+            for model in models
+        }
+        values = (
+            Company.objects.filter(pk=company.pk)
+            .annotate(**last_modified)
+            .values_list(*last_modified)
+            .first()
+        )
+        values = [value for value in values or [] if value is not None]
+        return max(values) if values else None
+
+    def get_conditional_state(self, *, last_modified):
+        if last_modified is None:
+            return None, None
+
+        fingerprint = "|".join(
+            [
+                self.request.get_full_path(),
+                str(self.request.headers.get("X-Company-UUID", "")),
+                last_modified.isoformat(),
+            ]
+        )
+        etag = quote_etag(hashlib.md5(fingerprint.encode()).hexdigest())
+        return etag, int(last_modified.timestamp())
+
+    def get_conditional_response(self, *, last_modified, response_method, **kwargs):
+        etag, last_modified = self.get_conditional_state(last_modified=last_modified)
+        if etag is not None:
+            response = get_conditional_response(
+                self.request, etag=etag, last_modified=last_modified
+            )
+            if response is not None:
+                patch_vary_headers(response, ["Authorization", "X-Company-UUID"])
+                return response
+
+        response = response_method(self.request, **kwargs)
+        if etag is not None and response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+            patch_vary_headers(response, ["Authorization", "X-Company-UUID"])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            last_modified=self.get_list_last_modified(queryset=self.get_queryset()),
+            response_method=super().list,
+            **kwargs,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset().filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        return self.get_conditional_response(
+            last_modified=self.get_instance_last_modified(queryset=queryset),
+            response_method=super().retrieve,
+            **kwargs,
+        )
+
     def create(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self.bulk_create(request, *args, **kwargs)
+
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
@@ -61,8 +241,245 @@ class BaseModelViewSet(viewsets.ModelViewSet):
 
         return Response(serializer.data)
 
+    def get_bulk_response(self, *, serializer, instances, errors):
+        return Response(
+            {
+                "results": [
+                    serializer.to_representation(instance) for instance in instances
+                ],
+                "errors": sorted(errors, key=lambda error: error["index"]),
+            },
+            status=status.HTTP_207_MULTI_STATUS if errors else status.HTTP_200_OK,
+        )
+
+    def validate_bulk_items(self, *, serializer, items):
+        valid_items, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                valid_items.append((index, serializer.run_validation(item)))
+            except serializers.ValidationError as e:
+                errors.append({"index": index, "errors": e.detail})
+        return valid_items, errors
+
+    def validate_bulk_names(self, *, items, used_names, errors):
+        model = self.serializer_class.Meta.model
+        valid_items = []
+        for index, name, item in items:
+            if name in used_names:
+                errors.append(
+                    {
+                        "index": index,
+                        "errors": {
+                            "name": [
+                                f"A {model.__name__.lower()} with the name '{name}' already exists."
+                            ]
+                        },
+                    }
+                )
+                continue
+            used_names.add(name)
+            valid_items.append(item)
+        return valid_items
+
+    def bulk_create(self, request, *args, **kwargs):
+        if not self.allow_bulk:
+            return Response(
+                {"detail": "Bulk create is not allowed."},
+                status=status.HTTP_405_METHOD_NOT_ALLOWED,
+            )
+
+        company = self.get_company()
+        model = self.serializer_class.Meta.model
+        serializer = self.get_serializer()
+
+        valid_items, errors = self.validate_bulk_items(
+            serializer=serializer, items=request.data
+        )
+        used_names = UtilService.get_used_names(
+            model_class=model,
+            company=company,
+            names=[validated_data["name"] for _, validated_data in valid_items],
+        )
+        valid_items = self.validate_bulk_names(
+            items=[
+                (index, validated_data["name"], validated_data)
+                for index, validated_data in valid_items
+            ],
+            used_names=used_names,
+            errors=errors,
+        )
+
+        with transaction.atomic():
+            instances = model.objects.bulk_create(
+                [
+                    model(company=company, **validated_data)
+                    for validated_data in valid_items
+                ]
+            )
+        if instances:
+            CountCache.invalidate(model=model, company_id=company.pk)
+
+        response = self.get_bulk_response(
+            serializer=serializer, instances=instances, errors=errors
+        )
+        if not errors:
+            response.status_code = status.HTTP_201_CREATED
+        return response
+
+    def bulk_partial_update(self, request, *args, **kwargs):
+        if not self.allow_bulk:
+            return Response(
+                {"detail": 'Method "PATCH" not allowed.'},
+                status=status.HTTP_405_METHOD_NOT_ALLOWED,
+            )
+        if not isinstance(request.data, list):
+            raise serializers.ValidationError(
+                {"non_field_errors": ["Expected a list of items."]}
+            )
+
+        company = self.get_company()
+        model = self.serializer_class.Meta.model
+        serializer = self.get_serializer(partial=True)
+
+        item_uuids = {
+            index: str(item["uuid"])
+            for index, item in enumerate(request.data)
+            if isinstance(item, dict)
+            and UtilService.is_valid_uuid(value=item.get("uuid"))
+        }
+        instances = {
+            str(instance.uuid): instance
+            for instance in self.get_queryset().filter(uuid__in=item_uuids.values())
+        }
+
+        valid_items, errors = self.validate_bulk_items(
+            serializer=serializer, items=request.data
+        )
+        updates = []
+        for index, validated_data in valid_items:
+            instance = instances.get(item_uuids.get(index))
+            if instance is None:
+                errors.append({"index": index, "errors": {"uuid": ["Not found."]}})
+                continue
+            name = validated_data.get("name", instance.name)
+            updates.append((index, name, (instance, validated_data)))
+
+        used_names = UtilService.get_used_names(
+            model_class=model,
+            company=company,
+            names=[name for _, name, _ in updates],
+            exclude_ids=[instance.pk for _, _, (instance, _) in updates],
+        )
+        updates = self.validate_bulk_names(
+            items=updates, used_names=used_names, errors=errors
+        )
+
+        modified = timezone.now()
+        update_fields = {"modified"}
+        for instance, validated_data in updates:
+            for field, value in validated_data.items():
+                setattr(instance, field, value)
+            instance.modified = modified
+            update_fields.update(validated_data)
+
+        instances = [instance for instance, _ in updates]
+        if instances:
+            with transaction.atomic():
+                model.objects.bulk_update(instances, list(update_fields))
+            CountCache.invalidate(model=model, company_id=company.pk)
+
+        return self.get_bulk_response(
+            serializer=serializer, instances=instances, errors=errors
+        )
+
+
+class EchoBuffer:
+    def write(self, value):
+        return value
+
+
+class ExportMixin:
+    export_chunk_size = 2000
+    export_format_query_param = "export_format"
+    export_content_types = {
+        "ndjson": "application/x-ndjson",
+        "csv": "text/csv",
+    }
+
+    @action(detail=False, methods=["get"])
+    def export(self, request, *args, **kwargs):
+        export_format = request.query_params.get(
+            self.export_format_query_param, "ndjson"
+        )
+        if export_format not in self.export_content_types:
+            raise serializers.ValidationError(
+                {
+                    self.export_format_query_param: (
+                        "Unsupported export format. Allowed formats are: "
+                        f'{", ".join(self.export_content_types)}.'
+                    )
+                }
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+        rows = (
+            serializer.to_representation(instance)
+            for instance in queryset.iterator(chunk_size=self.export_chunk_size)
+        )
+        stream_method = getattr(self, f"stream_{export_format}")
+
+        response = StreamingHttpResponse(
+            stream_method(rows=rows, serializer=serializer),
+            content_type=self.export_content_types[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.basename}.{export_format}"'
+        )
+        return response
+
+    def flatten_row(self, *, row, prefix=""):
+        flat_row = {}
+        for key, value in row.items():
+            if isinstance(value, dict):
+                flat_row.update(self.flatten_row(row=value, prefix=f"{prefix}{key}."))
+            else:
+                flat_row[f"{prefix}{key}"] = value
+        return flat_row
+
+    def get_export_fieldnames(self, *, serializer, prefix=""):
+        fieldnames = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.Serializer):
+                fieldnames += self.get_export_fieldnames(
+                    serializer=field, prefix=f"{prefix}{name}."
+                )
+            else:
+                fieldnames.append(f"{prefix}{name}")
+        return fieldnames
+
+    def stream_ndjson(self, *, rows, serializer):
+        for row in rows:
+            yield json.dumps(row, cls=JSONEncoder) + "\n"
+
+    def stream_csv(self, *, rows, serializer):
+        writer = csv.DictWriter(
+            EchoBuffer(),
+            fieldnames=self.get_export_fieldnames(serializer=serializer),
+            extrasaction="ignore",
+        )
+        yield writer.writeheader()
+        for row in rows:
+            yield writer.writerow(self.flatten_row(row=row))
+
 
 class BaseSerializer(serializers.ModelSerializer):
+    fields_query_param = "fields"
+    omit_query_param = "omit"
+    field_prefetches = {}
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         excluded_fields = [
@@ -75,3 +492,21 @@ class BaseSerializer(serializers.ModelSerializer):
         ]
         for field in excluded_fields:
             self.fields.pop(field, None)
+
+        request = self.context.get("request")
+        if request is not None and request.method == "GET":
+            fields, omit = self.get_sparse_fieldset(request)
+            for field in list(self.fields):
+                if (fields and field not in fields) or field in omit:
+                    self.fields.pop(field)
+
+    @classmethod
+    def get_sparse_fieldset(cls, request):
+        return tuple(
+            {
+                field.strip()
+                for field in request.query_params.get(query_param, "").split(",")
+                if field.strip()
+            }
+            for query_param in [cls.fields_query_param, cls.omit_query_param]
+        )
@@ -1,10 +1,17 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django_extensions.db.models import TimeStampedModel
 from django_softdelete.models import SoftDeleteModel
 from django.conf import settings
 import uuid
 
 
+def trigram_index(*, field_name, name):
+    return GinIndex(OpClass(Upper(field_name), name="gin_trgm_ops"), name=name)
+
+
 class Company(TimeStampedModel, SoftDeleteModel):
     uuid = models.UUIDField(
         default=uuid.uuid4, unique=True, editable=False, verbose_name="UUID"
@@ -45,6 +52,16 @@ class Partner(TimeStampedModel, SoftDeleteModel):
         max_length=50, null=True, blank=True, verbose_name="Phone Number"
     )
 
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            trigram_index(field_name="name", name="partner_name_trgm_idx"),
+            trigram_index(field_name="email", name="partner_email_trgm_idx"),
+            trigram_index(field_name="tax_id", name="partner_tax_id_trgm_idx"),
+            models.Index(
+                fields=["company", "modified"], name="partner_company_modified_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -74,6 +91,13 @@ class Category(TimeStampedModel, SoftDeleteModel):
         verbose_name="Parent Category",
     )
 
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            models.Index(
+                fields=["company", "modified"], name="category_company_modified_idx"
+            )
+        ]
+
     def __str__(self):
         return self.name
 
@@ -95,6 +119,14 @@ class Brand(TimeStampedModel, SoftDeleteModel):
     name = models.CharField(max_length=255, verbose_name="Name")
     description = models.TextField(null=True, blank=True, verbose_name="Description")
 
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            trigram_index(field_name="name", name="brand_name_trgm_idx"),
+            models.Index(
+                fields=["company", "modified"], name="brand_company_modified_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -116,6 +148,13 @@ class UnitOfMeasure(TimeStampedModel, SoftDeleteModel):
     name = models.CharField(max_length=255, verbose_name="Name")
     abbreviation = models.CharField(max_length=10, verbose_name="Abbreviation")
 
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            models.Index(
+                fields=["company", "modified"], name="uom_company_modified_idx"
+            )
+        ]
+
     def __str__(self):
         return self.name
 
@@ -171,6 +210,16 @@ class Product(TimeStampedModel, SoftDeleteModel):
     stock_quantity = models.IntegerField(verbose_name="Stock Quantity", default=0)
     has_variants = models.BooleanField(default=False, verbose_name="Has Variant")
 
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            trigram_index(field_name="name", name="product_name_trgm_idx"),
+            trigram_index(field_name="sku", name="product_sku_trgm_idx"),
+            trigram_index(field_name="barcode", name="product_barcode_trgm_idx"),
+            models.Index(
+                fields=["company", "modified"], name="product_company_modified_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -235,6 +284,42 @@ class ProductVariant(TimeStampedModel, SoftDeleteModel):
     cost = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Cost")
     price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Price")
     stock_quantity = models.IntegerField(verbose_name="Stock Quantity")
+    combination_key = models.CharField(
+        max_length=32,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Combination Key",
+    )
+    variant_value_ids = ArrayField(
+        models.BigIntegerField(),
+        default=list,
+        blank=True,
+        editable=False,
+        verbose_name="Variant Value IDs",
+    )
+
+    class Meta(TimeStampedModel.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "combination_key"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="unique_product_variant_combination",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["product", "sku"], name="variant_product_sku_idx"),
+            models.Index(
+                fields=["product", "barcode"], name="variant_product_barcode_idx"
+            ),
+            models.Index(
+                fields=["product", "price", "id"], name="variant_product_price_idx"
+            ),
+            GinIndex(fields=["variant_value_ids"], name="variant_value_ids_gin_idx"),
+            models.Index(
+                fields=["company", "modified"], name="variant_company_modified_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -256,6 +341,57 @@ class Image(TimeStampedModel, SoftDeleteModel):
     )
     url = models.ImageField(upload_to="images/", verbose_name="Image")
     in_use = models.BooleanField(default=False, verbose_name="In Use")
+    derivatives = models.JSONField(default=dict, blank=True, verbose_name="Derivatives")
+    content_hash = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Content Hash",
+    )
+
+    class Meta(TimeStampedModel.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=["company", "content_hash"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="unique_image_content_hash",
+            )
+        ]
+
+
+class ImageUpload(TimeStampedModel, SoftDeleteModel):
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.DO_NOTHING,
+        verbose_name="Company",
+        related_name="image_uploads",
+    )
+    uuid = models.UUIDField(
+        default=uuid.uuid4,
+        unique=True,
+        editable=False,
+        db_index=True,
+        verbose_name="UUID",
+    )
+    filename = models.CharField(max_length=255, verbose_name="Filename")
+    size = models.BigIntegerField(verbose_name="Size")
+    offset = models.BigIntegerField(default=0, verbose_name="Offset")
+    image = models.ForeignKey(
+        Image,
+        on_delete=models.DO_NOTHING,
+        null=True,
+        blank=True,
+        verbose_name="Image",
+        related_name="image_uploads",
+    )
+
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            models.Index(
+                fields=["company", "modified"], name="upload_company_modified_idx"
+            )
+        ]
 
 
 class ProductImage(TimeStampedModel, SoftDeleteModel):
@@ -316,6 +452,15 @@ class VariantOption(TimeStampedModel, SoftDeleteModel):
     )
     name = models.CharField(max_length=255, db_index=True, verbose_name="Name")
 
+    class Meta(TimeStampedModel.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "name"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="unique_variant_option_name",
+            )
+        ]
+
     def __str__(self):
         return self.name
 
@@ -348,5 +493,14 @@ class VariantValue(TimeStampedModel, SoftDeleteModel):
     )
     value = models.CharField(max_length=255, db_index=True, verbose_name="Value")
 
+    class Meta(TimeStampedModel.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=["option", "value"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="unique_variant_value",
+            )
+        ]
+
     def __str__(self):
         return self.value
@@ -1,19 +1,183 @@
+import hashlib
+import json
+import uuid
+from functools import partial
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
 from rest_framework import pagination
 from rest_framework.response import Response
 
 
+class CountStrategy:
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+
+
+class CountCache:
+    timeout = 300
+
+    def get_version_key(*, model, company_id):
+        return f"pagination:count:version:{model._meta.label_lower}:{company_id}"
+
+    def get_key(*, queryset, company_id):
+        version_key = CountCache.get_version_key(
+            model=queryset.model, company_id=company_id
+        )
+        version = cache.get(version_key)
+        if version is None:
+            version = uuid.uuid4().hex
+            cache.set(version_key, version, None)
+
+        fingerprint = hashlib.md5(
+            str(queryset.query.sql_with_params()).encode()
+        ).hexdigest()
+        return f"pagination:count:{version}:{fingerprint}"
+
+    def invalidate(*, model, company_id):
+        cache.delete(CountCache.get_version_key(model=model, company_id=company_id))
+
+
+class CountStrategyPaginator(Paginator):
+    estimate_threshold = 10000
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        *,
+        count_strategy=CountStrategy.EXACT,
+        company_id=None,
+        **kwargs,
+    ):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_strategy = count_strategy
+        self.company_id = company_id
+        self.count_is_exact = True
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+
+        if self.count_strategy == CountStrategy.ESTIMATED:
+            estimated_count = self.get_estimated_count()
+            if estimated_count >= self.estimate_threshold:
+                self.count_is_exact = False
+                return estimated_count
+
+        if self.count_strategy == CountStrategy.CACHED and self.company_id:
+            key = CountCache.get_key(
+                queryset=self.object_list, company_id=self.company_id
+            )
+            count = cache.get(key)
+            if count is None:
+                count = self.object_list.count()
+                cache.set(key, count, CountCache.timeout)
+            else:
+                self.count_is_exact = False
+            return count
+
+        return self.object_list.count()
+
+    def get_estimated_count(self):
+        if connections[self.object_list.db].vendor != "postgresql":
+            return 0
+        plan = json.loads(self.object_list.explain(format="json"))
+        return plan[0]["Plan"]["Plan Rows"]
+
+    def validate_number(self, number):
+        if self.count_is_exact:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        if self.count and self.count_is_exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.object_list[bottom : bottom + self.per_page], number, self
+        )
+
+
 class BasePagination(pagination.PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+    count_strategy = CountStrategy.EXACT
+
+    def paginate_queryset(self, queryset, request, view=None):
+        count_strategy = getattr(view, "count_strategy", self.count_strategy)
+        company_id = None
+        if count_strategy == CountStrategy.CACHED and hasattr(view, "get_company"):
+            company_id = view.get_company().pk
+
+        self.django_paginator_class = partial(
+            CountStrategyPaginator,
+            count_strategy=count_strategy,
+            company_id=company_id,
+        )
+        return super().paginate_queryset(queryset, request, view)
 
     def get_paginated_response(self, data):
         return Response(
             {
                 "count": self.page.paginator.count,
+                "count_is_exact": self.page.paginator.count_is_exact,
                 "num_pages": self.page.paginator.num_pages,
                 "next": self.get_next_link(),
                 "previous": self.get_previous_link(),
                 "results": data,
             }
         )
+
+
+class BaseCursorPagination(pagination.CursorPagination):
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-id"
+    ordering_query_param = "ordering"
+    mode_query_param = "pagination"
+    mode = "cursor"
+
+    @classmethod
+    def is_requested(cls, request):
+        return (
+            request.query_params.get(cls.mode_query_param) == cls.mode
+            or cls.cursor_query_param in request.query_params
+        )
+
+    def get_ordering(self, request, queryset, view):
+        ordering = request.query_params.get(self.ordering_query_param)
+        ordering_fields = getattr(view, "cursor_ordering_fields", [])
+        model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+        if (
+            not ordering
+            or ordering.lstrip("-") not in ordering_fields
+            or ordering.lstrip("-") not in model_fields
+        ):
+            return (self.ordering,)
+        if ordering.lstrip("-") == "id":
+            return (ordering,)
+        return (ordering, "-id" if ordering.startswith("-") else "id")
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
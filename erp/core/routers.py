@@ -0,0 +1,12 @@
+from rest_framework.routers import DefaultRouter
+
+
+class BulkRouter(DefaultRouter):
+    routes = [
+        (
+            route._replace(mapping={**route.mapping, "patch": "bulk_partial_update"})
+            if route.name == "{basename}-list"
+            else route
+        )
+        for route in DefaultRouter.routes
+    ]
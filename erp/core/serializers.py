@@ -1,8 +1,27 @@
+import warnings
+from decimal import Decimal
+
+from django.db.models import Count, Max, Min
 from rest_framework import serializers
 from PIL import Image as PilImage
 
 from core.mixins import BaseSerializer
-from core.models import Partner, Category, Company, Brand, Image, Product, UnitOfMeasure
+from core.models import (
+    Partner,
+    Category,
+    Company,
+    Brand,
+    Image,
+    ImageUpload,
+    Product,
+    ProductVariant,
+    UnitOfMeasure,
+)
+from core.services import (
+    ImageDerivativeService,
+    ProductImportService,
+    VariantMatrix,
+)
 
 
 class CompanySerializer(BaseSerializer):
@@ -40,29 +59,74 @@ class UnitOfMeasureSerializer(BaseSerializer):
 ### BEGIN - IMAGE ###
 
 
+class ImageUploadField(serializers.FileField):
+    image_signatures = {
+        "JPEG": b"\xff\xd8\xff",
+        "PNG": b"\x89PNG\r\n\x1a\n",
+    }
+    max_image_size = 2 * 1024 * 1024
+    max_image_pixels = 25_000_000
+
+    def to_internal_value(self, data):
+        file = super().to_internal_value(data)
+        valid_image_formats = list(self.image_signatures)
+
+        if file.size > self.max_image_size:
+            raise serializers.ValidationError(
+                f"Image size exceeds the limit of {self.max_image_size / (1024 * 1024)}MB."
+            )
+
+        file.seek(0)
+        header = file.read(8)
+        file.seek(0)
+        if not any(
+            header.startswith(signature) for signature in self.image_signatures.values()
+        ):
+            raise serializers.ValidationError(
+                f'Unsupported image format. Allowed formats are: {", ".join(valid_image_formats)}.'
+            )
+
+        dimensions_error = (
+            f"Image dimensions exceed the limit of {self.max_image_pixels} pixels."
+        )
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", PilImage.DecompressionBombWarning)
+                image = PilImage.open(file, formats=valid_image_formats)
+        except PilImage.DecompressionBombError:
+            raise serializers.ValidationError(dimensions_error)
+        except OSError as e:
+            raise serializers.ValidationError(f"Error processing image: {str(e)}")
+
+        width, height = image.size
+        if width * height > self.max_image_pixels:
+            raise serializers.ValidationError(dimensions_error)
+
+        file.seek(0)
+        file.image = image
+        return file
+
+
 class ImageSerializer(BaseSerializer):
+    url = ImageUploadField()
+
     class Meta:
         model = Image
         fields = "__all__"
 
-    def validate_image(self, value):
-        valid_image_formats = ["JPEG", "PNG"]
-        max_image_size = 2 * 1024 * 1024
 
-        try:
-            img = PilImage.open(value)
-            if img.format not in valid_image_formats:
-                raise serializers.ValidationError(
-                    f'Unsupported image format. Allowed formats are: {", ".join(valid_image_formats)}.'
-                )
-        except Exception as e:
-            raise serializers.ValidationError(f"Error processing image: {str(e)}")
+class ImageUploadSerializer(BaseSerializer):
+    class Meta:
+        model = ImageUpload
+        fields = ["uuid", "filename", "size", "offset"]
+        read_only_fields = ["offset"]
 
-        if value.size > max_image_size:
+    def validate_size(self, value):
+        max_image_size = ImageUploadField.max_image_size
+        if not 0 < value <= max_image_size:
             raise serializers.ValidationError(
                 f"Image size exceeds the limit of {max_image_size / (1024 * 1024)}MB."
             )
-
         return value
 
 
@@ -74,19 +138,57 @@ class ImageSerializer(BaseSerializer):
 class ProductListSerializer(BaseSerializer):
     brand = BrandSerializer(read_only=True)
     unit_of_measure = UnitOfMeasureSerializer(read_only=True)
+    thumbnail = serializers.SerializerMethodField(read_only=True)
+    field_prefetches = {"thumbnail": ["product_images"]}
 
     class Meta:
         model = Product
         fields = "__all__"
 
+    def get_thumbnail(self, instance):
+        for product_image in instance.product_images.all():
+            derivative_urls = ImageDerivativeService.get_urls(image=product_image.image)
+            return derivative_urls.get("thumbnail")
+        return None
+
+
+class ProductImportSerializer(BaseSerializer):
+    unit_of_measure_uuid = serializers.UUIDField(required=False, allow_null=True)
+    brand_uuid = serializers.UUIDField(required=False, allow_null=True)
+
+    class Meta:
+        model = Product
+        fields = [
+            "sku",
+            "barcode",
+            "name",
+            "description",
+            "base_cost",
+            "base_price",
+            "minimum_sale_unit",
+            "minimum_unit_price",
+            "stock_quantity",
+            "unit_of_measure_uuid",
+            "brand_uuid",
+        ]
+
+
+class ProductImportFileSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(
+        choices=ProductImportService.file_formats, default="csv"
+    )
+
 
 class VariantOptionSerializer(serializers.Serializer):
+    uuid = serializers.UUIDField(required=False)
     name = serializers.CharField()
     values = serializers.ListField(child=serializers.CharField())
 
 
 class ProductImageSerializer(serializers.Serializer):
     url = serializers.CharField(read_only=True)
+    derivatives = serializers.DictField(child=serializers.CharField(), read_only=True)
 
 
 class ImageListSerializer(serializers.ListField):
@@ -101,6 +203,37 @@ class ProductVariantSerializer(serializers.Serializer):
     images_data = ImageListSerializer(write_only=True, required=False)
 
 
+class ProductVariantListSerializer(BaseSerializer):
+    class Meta:
+        model = ProductVariant
+        fields = [
+            "uuid",
+            "name",
+            "sku",
+            "barcode",
+            "cost",
+            "price",
+            "stock_quantity",
+        ]
+
+
+class ProductVariantMatrixSerializer(serializers.Serializer):
+    uuid = serializers.UUIDField(source="product_variant.uuid", default=None)
+    name = serializers.CharField()
+    values = serializers.ListField(child=serializers.CharField())
+    sku = serializers.CharField(source="product_variant.sku", default=None)
+    barcode = serializers.CharField(source="product_variant.barcode", default=None)
+    cost = serializers.DecimalField(
+        source="product_variant.cost", max_digits=10, decimal_places=2, default=0
+    )
+    price = serializers.DecimalField(
+        source="product_variant.price", max_digits=10, decimal_places=2, default=0
+    )
+    stock_quantity = serializers.IntegerField(
+        source="product_variant.stock_quantity", default=0
+    )
+
+
 class ProductSerializer(BaseSerializer):
     unit_of_measure_uuid = serializers.UUIDField(write_only=True, required=False)
     brand_uuid = serializers.UUIDField(write_only=True, required=False)
@@ -116,25 +249,47 @@ class ProductSerializer(BaseSerializer):
 
     brand = BrandSerializer(read_only=True)
     unit_of_measure = UnitOfMeasureSerializer(read_only=True)
-    product_variants = serializers.SerializerMethodField(read_only=True)
+    variant_summary = serializers.SerializerMethodField(read_only=True)
     variant_options = serializers.SerializerMethodField(read_only=True)
     product_images = serializers.SerializerMethodField(read_only=True)
+    field_prefetches = {"variant_summary": ["variant_options"]}
 
     class Meta:
         model = Product
         fields = "__all__"
 
-    def get_product_variants(self, instance):
-        product_variants = instance.product_variants.all()
-        return ProductVariantSerializer(product_variants, many=True).data
+    def get_variant_summary(self, instance):
+        variant_summary = instance.product_variants.aggregate(
+            count=Count("id"), min_price=Min("price"), max_price=Max("price")
+        )
+        variant_matrix = VariantMatrix(
+            option_values={
+                variant_option: list(variant_option.variant_values.all())
+                for variant_option in instance.variant_options.all()
+            }
+        )
+        variant_summary["is_lazy"] = variant_matrix.is_lazy
+        if variant_matrix.is_lazy:
+            variant_summary["materialized_count"] = variant_summary["count"]
+            variant_summary["count"] = variant_matrix.count()
+            if variant_summary["count"] > variant_summary["materialized_count"]:
+                variant_summary["min_price"] = Decimal(0)
+                variant_summary["max_price"] = max(
+                    variant_summary["max_price"] or 0, Decimal(0)
+                )
+        return variant_summary
 
     def get_variant_options(self, instance):
         variant_options = instance.variant_options.all()
         data = []
         for variant_option in variant_options:
             option_data = {
+                "uuid": variant_option.uuid,
                 "name": variant_option.name,
-                "values": variant_option.variant_values.values_list("value", flat=True),
+                "values": [
+                    variant_value.value
+                    for variant_value in variant_option.variant_values.all()
+                ],
             }
             data.append(option_data)
         return VariantOptionSerializer(data, many=True).data
@@ -143,7 +298,12 @@ class ProductSerializer(BaseSerializer):
         product_images = instance.product_images.all()
         data = []
         for product_image in product_images:
-            image_data = {"url": product_image.image.url}
+            image_data = {
+                "url": product_image.image.url,
+                "derivatives": ImageDerivativeService.get_urls(
+                    image=product_image.image
+                ),
+            }
             data.append(image_data)
         return ProductImageSerializer(data, many=True).data
 
@@ -1,15 +1,40 @@
+import csv
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from copy import copy
+from itertools import islice
+from math import prod
+from uuid import UUID
+
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import transaction
-from django.shortcuts import get_object_or_404
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Exists, F, OuterRef, Q
+from rest_framework.generics import get_object_or_404
+from django.utils import timezone
+from django.utils.functional import cached_property
 from itertools import product as itertools_product
-from rest_framework.exceptions import ValidationError
-from rest_framework import serializers
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework import serializers, status
 
+from core.imaging import render_derivatives
+from core.pagination import CountCache
 from core.models import (
     Brand,
     Category,
     Company,
     Image,
+    ImageUpload,
     Product,
     ProductImage,
     ProductVariant,
@@ -18,14 +43,23 @@ from core.models import (
     UnitOfMeasure,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class UtilService:
-    def validate_uuid(*, uuid: str, model_class):
+    def validate_uuid(*, uuid: str, model_class, company: Company):
         if uuid:
-            instance = get_object_or_404(model_class=model_class, uuid=uuid)
+            instance = get_object_or_404(model_class, uuid=uuid, company=company)
             return instance
         return None
 
+    def is_valid_uuid(*, value):
+        try:
+            UUID(str(value))
+        except ValueError:
+            return False
+        return True
+
     def validate_if_name_is_used(*, action, validated_data, model_class, instance=None):
         if (
             model_class == Category
@@ -53,18 +87,75 @@ class UtilService:
         if queryset.exists():
             raise ValidationError(error_message)
 
+    def get_used_names(*, model_class, company, names, exclude_ids=None):
+        queryset = model_class.objects.filter(company=company, name__in=names)
+        if exclude_ids:
+            queryset = queryset.exclude(pk__in=exclude_ids)
+        return set(queryset.values_list("name", flat=True))
+
+    def bulk_soft_delete(*, queryset):
+        now = timezone.now()
+        return queryset.update(deleted_at=now, restored_at=None, modified=now)
+
+
+class CompanyCache:
+    max_size = 1024
+    timeout = 60
+    entries = OrderedDict()
+    lock = threading.Lock()
+
+    def get(*, user_id, company_uuid):
+        key = (user_id, str(company_uuid))
+        with CompanyCache.lock:
+            entry = CompanyCache.entries.get(key)
+            if entry is None:
+                return None
+            company, expires_at = entry
+            if expires_at < time.monotonic():
+                del CompanyCache.entries[key]
+                return None
+            CompanyCache.entries.move_to_end(key)
+        return copy(company)
+
+    def set(*, user_id, company_uuid, company):
+        key = (user_id, str(company_uuid))
+        with CompanyCache.lock:
+            CompanyCache.entries[key] = (
+                copy(company),
+                time.monotonic() + CompanyCache.timeout,
+            )
+            CompanyCache.entries.move_to_end(key)
+            while len(CompanyCache.entries) > CompanyCache.max_size:
+                CompanyCache.entries.popitem(last=False)
+
+    def invalidate(*, company):
+        with CompanyCache.lock:
+            for key in [
+                key for key in CompanyCache.entries if key[1] == str(company.uuid)
+            ]:
+                del CompanyCache.entries[key]
+
 
 class CompanyService:
+    def get_for_user(*, user, company_uuid):
+        company = CompanyCache.get(user_id=user.pk, company_uuid=company_uuid)
+        if company is None:
+            company = get_object_or_404(Company, uuid=company_uuid, user_id=user.pk)
+            CompanyCache.set(
+                user_id=user.pk, company_uuid=company_uuid, company=company
+            )
+        return company
+
     def create(*, user: User, serializer):
         serializer.is_valid(raise_exception=True)
         validated_data = serializer.validated_data
 
-        if Company.objects.filter(user=user).exists():
+        if Company.objects.filter(user_id=user.pk).exists():
             raise serializers.ValidationError(
                 "Este usuario ya tiene asignada una compañía."
             )
 
-        validated_data["user"] = user
+        validated_data["user_id"] = user.pk
 
         return serializer.save()
 
@@ -79,7 +170,9 @@ class CategoryService:
         validated_data = serializer.validated_data
 
         parent_uuid = validated_data.pop("parent_uuid", None)
-        parent = UtilService.validate_uuid(uuid=parent_uuid, model_class=Category)
+        parent = UtilService.validate_uuid(
+            uuid=parent_uuid, model_class=Category, company=company
+        )
         if parent and parent.parent:
             raise serializers.ValidationError(
                 "Una categoría no puede tener más de un nivel de padres."
@@ -113,10 +206,12 @@ class ProductService:
         brand_uuid = validated_data.pop("brand_uuid", None)
 
         validated_data["unit_of_measure"] = UtilService.validate_uuid(
-            uuid=unit_of_measure_uuid, model_class=UnitOfMeasure
+            uuid=unit_of_measure_uuid,
+            model_class=UnitOfMeasure,
+            company=validated_data["company"],
         )
         validated_data["brand"] = UtilService.validate_uuid(
-            uuid=brand_uuid, model_class=Brand
+            uuid=brand_uuid, model_class=Brand, company=validated_data["company"]
         )
 
         return validated_data
@@ -191,23 +286,613 @@ class ProductService:
         return product
 
 
+class ProductImportService:
+    batch_size = 1000
+    file_formats = ["csv", "ndjson"]
+
+    def read_rows(*, file, file_format):
+        if file_format not in ProductImportService.file_formats:
+            raise serializers.ValidationError(
+                "Unsupported import format. Allowed formats are: "
+                f'{", ".join(ProductImportService.file_formats)}.'
+            )
+
+        if file_format == "csv":
+            for row in csv.DictReader(file):
+                yield {
+                    key: value if value != "" else None for key, value in row.items()
+                }
+        else:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    yield line
+
+    def import_rows(self, *, company: Company, serializer, rows):
+        result = {"created": 0, "errors": []}
+        used_names = set()
+        numbered_rows = enumerate(rows, start=1)
+        while batch := list(islice(numbered_rows, self.batch_size)):
+            products, errors = self.validate_batch(
+                company=company,
+                serializer=serializer,
+                batch=batch,
+                used_names=used_names,
+            )
+            with transaction.atomic():
+                Product.objects.bulk_create(products)
+            result["created"] += len(products)
+            result["errors"] += errors
+
+        if result["created"]:
+            CountCache.invalidate(model=Product, company_id=company.pk)
+        return result
+
+    def validate_batch(self, *, company, serializer, batch, used_names):
+        valid_rows, errors = [], []
+        for row_number, row in batch:
+            try:
+                valid_rows.append((row_number, serializer.run_validation(row)))
+            except serializers.ValidationError as e:
+                errors.append({"row": row_number, "errors": e.detail})
+
+        brands = self.get_instances_by_uuid(
+            company=company,
+            model_class=Brand,
+            valid_rows=valid_rows,
+            field="brand_uuid",
+        )
+        units_of_measure = self.get_instances_by_uuid(
+            company=company,
+            model_class=UnitOfMeasure,
+            valid_rows=valid_rows,
+            field="unit_of_measure_uuid",
+        )
+        used_names.update(
+            Product.objects.filter(
+                company=company,
+                name__in=[validated_data["name"] for _, validated_data in valid_rows],
+            ).values_list("name", flat=True)
+        )
+
+        products = []
+        for row_number, validated_data in valid_rows:
+            brand_uuid = validated_data.pop("brand_uuid", None)
+            unit_of_measure_uuid = validated_data.pop("unit_of_measure_uuid", None)
+
+            row_errors = {}
+            if validated_data["name"] in used_names:
+                row_errors["name"] = [
+                    f"A product with the name '{validated_data['name']}' already exists."
+                ]
+            if brand_uuid and brand_uuid not in brands:
+                row_errors["brand_uuid"] = [f"Brand '{brand_uuid}' does not exist."]
+            if unit_of_measure_uuid and unit_of_measure_uuid not in units_of_measure:
+                row_errors["unit_of_measure_uuid"] = [
+                    f"Unit of measure '{unit_of_measure_uuid}' does not exist."
+                ]
+            if row_errors:
+                errors.append({"row": row_number, "errors": row_errors})
+                continue
+
+            used_names.add(validated_data["name"])
+            products.append(
+                Product(
+                    company=company,
+                    brand=brands.get(brand_uuid),
+                    unit_of_measure=units_of_measure.get(unit_of_measure_uuid),
+                    **validated_data,
+                )
+            )
+
+        errors.sort(key=lambda error: error["row"])
+        return products, errors
+
+    def get_instances_by_uuid(self, *, company, model_class, valid_rows, field):
+        uuids = {
+            validated_data[field]
+            for _, validated_data in valid_rows
+            if validated_data.get(field)
+        }
+        if not uuids:
+            return {}
+        return {
+            instance.uuid: instance
+            for instance in model_class.objects.filter(company=company, uuid__in=uuids)
+        }
+
+
 class ProductImageService:
     @transaction.atomic
     def create(*, product, images_data):
-        image_ids = []
-        for image_uuid in images_data:
-            image = UtilService.validate_uuid(uuid=image_uuid, model_class=Image)
-            product_image = ProductImage.objects.create(
-                company=product.company, product=product, image=image
+        image_uuids = list(dict.fromkeys(images_data))
+        image_ids = dict(
+            Image.objects.filter(
+                company=product.company, uuid__in=image_uuids
+            ).values_list("uuid", "id")
+        )
+
+        unknown_uuids = [
+            image_uuid for image_uuid in image_uuids if image_uuid not in image_ids
+        ]
+        if unknown_uuids:
+            raise ValidationError(
+                {
+                    "images_data": [
+                        f"An image with the UUID '{image_uuid}' does not exist."
+                        for image_uuid in unknown_uuids
+                    ]
+                }
+            )
+
+        product_images = ProductImage.objects.filter(
+            company=product.company, product=product, product_variant__isnull=True
+        )
+        linked_image_ids = set(product_images.values_list("image_id", flat=True))
+        new_image_ids = [
+            image_ids[image_uuid]
+            for image_uuid in image_uuids
+            if image_ids[image_uuid] not in linked_image_ids
+        ]
+        removed_image_ids = linked_image_ids - set(image_ids.values())
+
+        ProductImage.objects.bulk_create(
+            [
+                ProductImage(
+                    company=product.company, product=product, image_id=image_id
+                )
+                for image_id in new_image_ids
+            ]
+        )
+        if removed_image_ids:
+            UtilService.bulk_soft_delete(
+                queryset=product_images.filter(image_id__in=removed_image_ids)
+            )
+
+        changed_image_ids = [*new_image_ids, *removed_image_ids]
+        if changed_image_ids:
+            Image.objects.filter(id__in=changed_image_ids).update(
+                in_use=Exists(ProductImage.objects.filter(image=OuterRef("pk"))),
+                modified=timezone.now(),
+            )
+
+
+class ImageDerivativeService:
+    executor = None
+
+    @classmethod
+    def get_executor(cls):
+        if cls.executor is None:
+            cls.executor = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_DERIVATIVE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return cls.executor
+
+    @classmethod
+    def reset_executor(cls, *, executor):
+        # A worker that died takes the whole pool down, start over on the next
+        # submit instead of failing every later upload.
+        if cls.executor is executor:
+            cls.executor = None
+
+    def get_render_kwargs(*, image):
+        return {
+            "media_root": str(settings.MEDIA_ROOT),
+            "name": image.url.name,
+            "derivatives": settings.IMAGE_DERIVATIVES,
+        }
+
+    def generate(*, image):
+        image.derivatives = render_derivatives(
+            **ImageDerivativeService.get_render_kwargs(image=image)
+        )
+        ImageDerivativeService.save(image=image, derivatives=image.derivatives)
+
+    def save(*, image, derivatives):
+        modified = timezone.now()
+        with transaction.atomic():
+            Image.objects.filter(pk=image.pk).update(
+                derivatives=derivatives, modified=modified
+            )
+            Product.objects.filter(
+                Exists(ProductImage.objects.filter(product=OuterRef("pk"), image=image))
+            ).update(modified=modified)
+
+    def schedule(*, image):
+        def submit():
+            executor = ImageDerivativeService.get_executor()
+            try:
+                future = executor.submit(
+                    render_derivatives,
+                    **ImageDerivativeService.get_render_kwargs(image=image),
+                )
+            except BrokenProcessPool as error:
+                ImageDerivativeService.reset_executor(executor=executor)
+                logger.error(
+                    "Could not generate derivatives for image %s: %s",
+                    image.uuid,
+                    error,
+                )
+                return
+            future.add_done_callback(
+                lambda future: save_derivatives(future=future, executor=executor)
+            )
+
+        def save_derivatives(*, future, executor):
+            if isinstance(future.exception(), BrokenProcessPool):
+                ImageDerivativeService.reset_executor(executor=executor)
+            if future.exception() is not None:
+                logger.error(
+                    "Could not generate derivatives for image %s: %s",
+                    image.uuid,
+                    future.exception(),
+                )
+                return
+            try:
+                ImageDerivativeService.save(image=image, derivatives=future.result())
+            finally:
+                close_old_connections()
+
+        transaction.on_commit(submit)
+
+    def get_urls(*, image):
+        return {
+            derivative: default_storage.url(name)
+            for derivative, name in image.derivatives.items()
+        }
+
+
+class ImageService:
+    def get_content_hash(*, file):
+        hasher = hashlib.sha256()
+        for chunk in file.chunks():
+            hasher.update(chunk)
+        file.seek(0)
+        return hasher.hexdigest()
+
+    def get_name_condition(*, names):
+        condition = Q(url__in=names)
+        for name in names:
+            stem = os.path.splitext(os.path.basename(name))[0]
+            for derivative in settings.IMAGE_DERIVATIVES:
+                if stem.endswith(f"_{derivative}"):
+                    condition |= Q(derivatives__contains={derivative: name})
+        return condition
+
+    def get_used_names(*, queryset, names):
+        used_names = set()
+        for url, derivatives in queryset.filter(
+            ImageService.get_name_condition(names=names)
+        ).values_list("url", "derivatives"):
+            used_names.update([url, *derivatives.values()])
+        return used_names.intersection(names)
+
+    def get_by_name(*, company, name):
+        return (
+            Image.objects.filter(company=company)
+            .filter(ImageService.get_name_condition(names=[name]))
+            .first()
+        )
+
+    def create(*, company, serializer, content_hash):
+        if content_hash is not None:
+            image = Image.objects.filter(
+                company=company, content_hash=content_hash
+            ).first()
+            if image is not None:
+                return image, False
+
+        serializer.is_valid(raise_exception=True)
+        image = Image(
+            company=company, content_hash=content_hash, **serializer.validated_data
+        )
+        if content_hash is not None:
+            extension = os.path.splitext(image.url.name)[1].lower()
+            image.url.name = f"{content_hash}{extension}"
+        try:
+            with transaction.atomic():
+                image.save()
+        except IntegrityError:
+            image.url.delete(save=False)
+            if content_hash is None:
+                raise
+            image = Image.objects.get(company=company, content_hash=content_hash)
+            return image, False
+
+        return image, True
+
+    def bulk_create(*, company, serializer, files, content_hashes):
+        existing_images = {
+            image.content_hash: image
+            for image in Image.objects.filter(
+                company=company, content_hash__in=content_hashes
+            )
+        }
+        pending_indexes = {}
+        for index, content_hash in enumerate(content_hashes):
+            if content_hash not in existing_images:
+                pending_indexes.setdefault(content_hash, index)
+
+        url_field = serializer.fields["url"]
+
+        def validate(index):
+            try:
+                return index, url_field.run_validation(files[index]), None
+            except ValidationError as e:
+                return index, None, e.detail
+
+        validated_files = []
+        if pending_indexes:
+            max_workers = min(settings.IMAGE_BATCH_UPLOAD_WORKERS, len(pending_indexes))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                validated_files = list(executor.map(validate, pending_indexes.values()))
+
+        file_errors = {}
+        new_images = []
+        for index, file, detail in validated_files:
+            if detail is not None:
+                file_errors[content_hashes[index]] = detail
+                continue
+            image = Image(company=company, url=file, content_hash=content_hashes[index])
+            extension = os.path.splitext(image.url.name)[1].lower()
+            image.url.name = f"{content_hashes[index]}{extension}"
+            new_images.append(image)
+
+        Image.objects.bulk_create(new_images, ignore_conflicts=True)
+        created_images = {
+            image.content_hash: image
+            for image in Image.objects.filter(
+                company=company,
+                content_hash__in=[image.content_hash for image in new_images],
+            )
+        }
+        inserted_hashes = set()
+        for image in new_images:
+            stored_image = created_images[image.content_hash]
+            if stored_image.uuid == image.uuid:
+                inserted_hashes.add(image.content_hash)
+            elif image.url.name != stored_image.url.name:
+                image.url.delete(save=False)
+
+        results, errors = [], []
+        for index, content_hash in enumerate(content_hashes):
+            if content_hash in file_errors:
+                errors.append(
+                    {
+                        "index": index,
+                        "filename": files[index].name,
+                        "errors": {"url": file_errors[content_hash]},
+                    }
+                )
+                continue
+            image = existing_images.get(content_hash) or created_images[content_hash]
+            created = (
+                content_hash in inserted_hashes
+                and pending_indexes[content_hash] == index
+            )
+            results.append((index, image, created))
+        return results, errors
+
+
+class UploadOffsetConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The upload offset does not match the bytes received."
+    default_code = "upload_offset_conflict"
+
+
+class UploadedChunksFile(File):
+    def temporary_file_path(self):
+        return self.file.name
+
+
+class ImageUploadService:
+    chunk_size = 64 * 1024
+
+    def get_path(*, image_upload):
+        return os.path.join(
+            str(settings.MEDIA_ROOT), "uploads", f"{image_upload.uuid}.part"
+        )
+
+    def create(*, company, serializer):
+        serializer.is_valid(raise_exception=True)
+        image_upload = serializer.save(company=company)
+
+        path = ImageUploadService.get_path(image_upload=image_upload)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "wb").close()
+
+        return image_upload
+
+    def write_chunk(*, image_upload, offset, stream):
+        if image_upload.image_id:
+            raise ValidationError({"detail": "The upload has already been finalized."})
+        if offset != image_upload.offset:
+            raise UploadOffsetConflict(
+                f"Expected offset {image_upload.offset}, received {offset}."
+            )
+
+        written = 0
+        path = ImageUploadService.get_path(image_upload=image_upload)
+        with open(path, "r+b") as file:
+            file.seek(offset)
+            while stream is not None:
+                chunk = stream.read(ImageUploadService.chunk_size)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if offset + written > image_upload.size:
+                    file.truncate(offset)
+                    raise ValidationError(
+                        {"detail": "The chunk exceeds the declared upload size."}
+                    )
+                file.write(chunk)
+
+        updated = ImageUpload.objects.filter(pk=image_upload.pk, offset=offset).update(
+            offset=offset + written, modified=timezone.now()
+        )
+        if not updated:
+            raise UploadOffsetConflict()
+
+        image_upload.offset = offset + written
+        return image_upload
+
+    def open_file(*, image_upload):
+        path = ImageUploadService.get_path(image_upload=image_upload)
+        return UploadedChunksFile(open(path, "rb"), name=image_upload.filename)
+
+    @transaction.atomic
+    def finalize(*, image_upload, serializer):
+        if image_upload.offset != image_upload.size:
+            raise ValidationError(
+                {
+                    "offset": [
+                        f"The upload is incomplete: {image_upload.offset} of "
+                        f"{image_upload.size} bytes received."
+                    ]
+                }
+            )
+
+        file = serializer.initial_data["url"]
+        image, created = ImageService.create(
+            company=image_upload.company,
+            serializer=serializer,
+            content_hash=ImageService.get_content_hash(file=file),
+        )
+        if not created:
+            os.remove(file.temporary_file_path())
+
+        image_upload.image = image
+        image_upload.save(update_fields=["image", "modified"])
+
+        return image, created
+
+
+class ImageGarbageCollectorService:
+    batch_size = 500
+    dry_run = False
+
+    def refresh_in_use(self):
+        linked_images = ProductImage.objects.filter(image=OuterRef("pk"))
+        images = Image.objects.filter(in_use=False).filter(Exists(linked_images))
+        unused_images = Image.objects.filter(in_use=True).exclude(Exists(linked_images))
+        if self.dry_run:
+            return images.count() + unused_images.count()
+
+        modified = timezone.now()
+        return images.update(in_use=True, modified=modified) + unused_images.update(
+            in_use=False, modified=modified
+        )
+
+    def get_batches(self, *, queryset):
+        last_id = 0
+        while True:
+            batch = list(
+                queryset.filter(id__gt=last_id).order_by("id")[: self.batch_size]
             )
-            image_ids.append(product_image.id)
+            if not batch:
+                return
+            last_id = batch[-1].id
+            yield batch
+
+    def collect_images(self, *, before):
+        images = (
+            Image.global_objects.filter(created__lt=before)
+            .exclude(Exists(ProductImage.objects.filter(image=OuterRef("pk"))))
+            .only("id", "url", "derivatives")
+        )
+        for batch in self.get_batches(queryset=images):
+            if not self.dry_run:
+                image_ids = [image.id for image in batch]
+                with transaction.atomic():
+                    ImageUpload.global_objects.filter(image_id__in=image_ids).update(
+                        image=None
+                    )
+                    Image.global_objects.filter(id__in=image_ids).delete()
+
+                names = [image.url.name for image in batch]
+                used_names = set(
+                    Image.global_objects.filter(url__in=names).values_list(
+                        "url", flat=True
+                    )
+                )
+                for image in batch:
+                    if image.url.name in used_names:
+                        continue
+                    for name in [image.url.name, *image.derivatives.values()]:
+                        default_storage.delete(name)
+            yield len(batch)
+
+    def collect_uploads(self, *, before):
+        image_uploads = ImageUpload.global_objects.filter(
+            image__isnull=True, modified__lt=before
+        ).only("id", "uuid")
+        for batch in self.get_batches(queryset=image_uploads):
+            if not self.dry_run:
+                ImageUpload.global_objects.filter(
+                    id__in=[image_upload.id for image_upload in batch]
+                ).delete()
+                for image_upload in batch:
+                    path = ImageUploadService.get_path(image_upload=image_upload)
+                    if os.path.exists(path):
+                        os.remove(path)
+            yield len(batch)
 
-            image.in_use = True
-            image.save()
+    def get_stale_files(self, *, directory, before):
+        path = os.path.join(str(settings.MEDIA_ROOT), directory)
+        if not os.path.isdir(path):
+            return
+        with os.scandir(path) as entries:
+            batch = []
+            for entry in entries:
+                if entry.is_file() and entry.stat().st_mtime < before.timestamp():
+                    batch.append(f"{directory}/{entry.name}")
+                if len(batch) == self.batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
 
-        ProductImage.objects.filter(company=product.company, product=product).exclude(
-            id__in=image_ids
-        ).delete()
+    def collect_files(self, *, before):
+        for directory in ["images", "images/derivatives"]:
+            for names in self.get_stale_files(directory=directory, before=before):
+                used_names = ImageService.get_used_names(
+                    queryset=Image.global_objects.all(), names=names
+                )
+                yield self.delete_files(
+                    names=[name for name in names if name not in used_names]
+                )
+
+        for names in self.get_stale_files(directory="uploads", before=before):
+            upload_uuids = {
+                os.path.splitext(os.path.basename(name))[0]: name for name in names
+            }
+            used_uuids = {
+                str(upload_uuid)
+                for upload_uuid in ImageUpload.global_objects.filter(
+                    uuid__in=[
+                        upload_uuid
+                        for upload_uuid in upload_uuids
+                        if UtilService.is_valid_uuid(value=upload_uuid)
+                    ]
+                ).values_list("uuid", flat=True)
+            }
+            yield self.delete_files(
+                names=[
+                    name
+                    for upload_uuid, name in upload_uuids.items()
+                    if upload_uuid not in used_uuids
+                ]
+            )
+
+    def delete_files(self, *, names):
+        if not self.dry_run:
+            for name in names:
+                default_storage.delete(name)
+        return len(names)
 
 
 class ProductVariantService:
@@ -218,70 +903,471 @@ class ProductVariantService:
 
     @transaction.atomic
     def set_product_variants_data(self, *, product, product_variants_data):
-        for product_variant_data in product_variants_data:
-            product_variant = get_object_or_404(
-                model_class=ProductVariant,
-                company=product.company,
-                product=product,
-                name=product_variant_data["name"],
+        if not product_variants_data:
+            return
+
+        variant_names = [
+            product_variant_data["name"]
+            for product_variant_data in product_variants_data
+        ]
+        product_variants = {
+            product_variant.name: product_variant
+            for product_variant in ProductVariant.objects.filter(
+                company=product.company, product=product, name__in=variant_names
+            )
+        }
+
+        unknown_names = [name for name in variant_names if name not in product_variants]
+        combinations = {}
+        if unknown_names:
+            variant_matrix = self.get_variant_matrix(product=product)
+            if variant_matrix.is_lazy:
+                combinations = {
+                    name: variant_matrix.find_combination(name=name)
+                    for name in unknown_names
+                }
+                unknown_names = [
+                    name
+                    for name, combination in combinations.items()
+                    if not combination
+                ]
+        if unknown_names:
+            raise ValidationError(
+                {
+                    "product_variants_data": [
+                        f"A product variant with the name '{name}' does not exist."
+                        for name in unknown_names
+                    ]
+                }
             )
+
+        modified = timezone.now()
+        new_variants = []
+        for product_variant_data in product_variants_data:
+            product_variant = product_variants.get(product_variant_data["name"])
+            if product_variant is None:
+                product_variant = ProductVariant(
+                    company=product.company,
+                    product=product,
+                    name=product_variant_data["name"],
+                    combination_key=variant_matrix.get_key(
+                        combination=combinations[product_variant_data["name"]]
+                    ),
+                    variant_value_ids=variant_matrix.get_value_ids(
+                        combination=combinations[product_variant_data["name"]]
+                    ),
+                    stock_quantity=0,
+                )
+                product_variants[product_variant.name] = product_variant
+                new_variants.append(product_variant)
             product_variant.sku = product_variant_data["sku"]
             product_variant.cost = product_variant_data["cost"]
             product_variant.price = product_variant_data["price"]
-            product_variant.save()
+            product_variant.modified = modified
+
+        ProductVariant.objects.bulk_update(
+            [
+                product_variant
+                for product_variant in product_variants.values()
+                if product_variant.pk
+            ],
+            ["sku", "cost", "price", "modified"],
+        )
+        ProductVariant.objects.bulk_create(new_variants)
+
+    def get_variant_matrix(self, *, product):
+        variant_values = (
+            VariantValue.objects.filter(company=product.company, product=product)
+            .select_related("option")
+            .order_by("option_id", "id")
+        )
+
+        option_values = {}
+        for variant_value in variant_values:
+            option_values.setdefault(variant_value.option, []).append(variant_value)
+
+        return VariantMatrix(option_values=option_values)
+
+    def get_variant_matrix_rows(self, *, product, variant_matrix, combinations):
+        combination_keys = [
+            variant_matrix.get_key(combination=combination)
+            for combination in combinations
+        ]
+        product_variants = {
+            product_variant.combination_key: product_variant
+            for product_variant in ProductVariant.objects.filter(
+                company=product.company,
+                product=product,
+                combination_key__in=combination_keys,
+            )
+        }
+
+        return [
+            {
+                "name": variant_matrix.get_name(combination=combination),
+                "values": [variant_value.value for variant_value in combination],
+                "product_variant": product_variants.get(combination_key),
+            }
+            for combination_key, combination in zip(combination_keys, combinations)
+        ]
 
     def generate_product_variants(self, *, product):
-        variant_options = VariantOption.objects.filter(
+        variant_matrix = self.get_variant_matrix(product=product)
+
+        product_variants = ProductVariant.objects.filter(
             company=product.company, product=product
         )
+        if variant_matrix.is_lazy:
+            return self.refresh_lazy_product_variants(
+                product_variants=product_variants, variant_matrix=variant_matrix
+            )
+
+        existing_variants = {}
+        legacy_variants = []
+        for variant_id, combination_key, variant_name in product_variants.values_list(
+            "id", "combination_key", "name"
+        ):
+            if combination_key is None:
+                legacy_variants.append((variant_id, variant_name))
+            else:
+                existing_variants[combination_key] = (variant_id, variant_name)
+
+        # Rows without a combination key predate it, match them by name and
+        # treat the ones that no longer fit the matrix as stale.
+        stale_variant_ids = []
+        legacy_variant_ids = set()
+        for variant_id, variant_name in legacy_variants:
+            combination = variant_matrix.find_combination(name=variant_name)
+            combination_key = (
+                variant_matrix.get_key(combination=combination)
+                if combination is not None
+                else None
+            )
+            if combination_key is None or combination_key in existing_variants:
+                stale_variant_ids.append(variant_id)
+                continue
+
+            existing_variants[combination_key] = (variant_id, variant_name)
+            legacy_variant_ids.add(variant_id)
 
-        option_values = []
-        for option in variant_options:
-            values = VariantValue.objects.filter(company=product.company, option=option)
-            option_values.append(values)
-
-        combinations = list(itertools_product(*option_values))
-        option_names = " ".join([option.name for option in variant_options])
-        product_variant_ids = []
-        for combination in combinations:
-            if combination:
-                variant_name = (
-                    option_names
-                    + " - "
-                    + (" ".join([value.value for value in combination]))
+        modified = timezone.now()
+        new_variants = []
+        renamed_variants = []
+        for combination in variant_matrix.get_combinations():
+            combination_key = variant_matrix.get_key(combination=combination)
+            existing_variant = existing_variants.pop(combination_key, None)
+            variant_name = variant_matrix.get_name(combination=combination)
+            if existing_variant is None:
+                new_variants.append(
+                    ProductVariant(
+                        company=product.company,
+                        product=product,
+                        name=variant_name,
+                        combination_key=combination_key,
+                        variant_value_ids=variant_matrix.get_value_ids(
+                            combination=combination
+                        ),
+                        cost=0,
+                        price=0,
+                        stock_quantity=0,
+                    )
                 )
-                product_variant, created = ProductVariant.objects.get_or_create(
-                    company=product.company,
-                    product=product,
-                    name=variant_name,
-                    defaults={"cost": 0, "price": 0, "stock_quantity": 0},
+            elif (
+                existing_variant[1] != variant_name
+                or existing_variant[0] in legacy_variant_ids
+            ):
+                renamed_variants.append(
+                    ProductVariant(
+                        id=existing_variant[0],
+                        name=variant_name,
+                        combination_key=combination_key,
+                        variant_value_ids=variant_matrix.get_value_ids(
+                            combination=combination
+                        ),
+                        modified=modified,
+                    )
                 )
-                product_variant_ids.append(product_variant.id)
 
-        ProductVariant.objects.filter(company=product.company, product=product).exclude(
-            id__in=product_variant_ids
-        ).delete()
+        ProductVariant.objects.bulk_update(
+            renamed_variants,
+            ["name", "combination_key", "variant_value_ids", "modified"],
+        )
+        ProductVariant.objects.bulk_create(new_variants)
 
-        return len(product_variant_ids)
+        stale_variant_ids.extend(
+            variant_id for variant_id, _ in existing_variants.values()
+        )
+        self.delete_stale_product_variants(
+            product_variants=product_variants, stale_variant_ids=stale_variant_ids
+        )
+
+        return variant_matrix.count()
+
+    def refresh_lazy_product_variants(self, *, product_variants, variant_matrix):
+        modified = timezone.now()
+        renamed_variants = []
+        stale_variant_ids = []
+        claimed_keys = set()
+        # Keyed rows go first so a legacy row can't claim a key that's taken.
+        for variant_id, variant_name, variant_value_ids in product_variants.order_by(
+            F("combination_key").asc(nulls_last=True)
+        ).values_list("id", "name", "variant_value_ids"):
+            if variant_value_ids:
+                combination = variant_matrix.find_combination_by_value_ids(
+                    value_ids=variant_value_ids
+                )
+            else:
+                combination = variant_matrix.find_combination(name=variant_name)
+            combination_key = (
+                variant_matrix.get_key(combination=combination)
+                if combination is not None
+                else None
+            )
+            if combination_key is None or combination_key in claimed_keys:
+                stale_variant_ids.append(variant_id)
+                continue
+
+            claimed_keys.add(combination_key)
+            combination_name = variant_matrix.get_name(combination=combination)
+            if combination_name != variant_name or not variant_value_ids:
+                renamed_variants.append(
+                    ProductVariant(
+                        id=variant_id,
+                        name=combination_name,
+                        combination_key=combination_key,
+                        variant_value_ids=variant_matrix.get_value_ids(
+                            combination=combination
+                        ),
+                        modified=modified,
+                    )
+                )
+
+        ProductVariant.objects.bulk_update(
+            renamed_variants,
+            ["name", "combination_key", "variant_value_ids", "modified"],
+        )
+        self.delete_stale_product_variants(
+            product_variants=product_variants, stale_variant_ids=stale_variant_ids
+        )
+
+        return variant_matrix.count()
+
+    def delete_stale_product_variants(self, *, product_variants, stale_variant_ids):
+        if stale_variant_ids:
+            UtilService.bulk_soft_delete(
+                queryset=ProductImage.objects.filter(
+                    product_variant_id__in=stale_variant_ids
+                )
+            )
+            UtilService.bulk_soft_delete(
+                queryset=product_variants.filter(id__in=stale_variant_ids)
+            )
+
+    def rename_variant_options(self, *, variant_options, option_renames):
+        modified = timezone.now()
+        renamed_options = [
+            variant_option
+            for variant_option in variant_options.filter(uuid__in=option_renames)
+            if variant_option.name != option_renames[variant_option.uuid]
+        ]
+        for variant_option in renamed_options:
+            variant_option.name = variant_option.uuid.hex
+            variant_option.modified = modified
+        try:
+            with transaction.atomic():
+                VariantOption.objects.bulk_update(renamed_options, ["name", "modified"])
+                for variant_option in renamed_options:
+                    variant_option.name = option_renames[variant_option.uuid]
+                VariantOption.objects.bulk_update(renamed_options, ["name"])
+        except IntegrityError:
+            raise ValidationError(
+                {"variant_options_data": ["Option names must be unique."]}
+            )
 
     def create_variants(self, *, product, variant_options_data):
-        variant_option_ids = []
-        for variant_option_data in variant_options_data:
-            variant_option, created = VariantOption.objects.get_or_create(
-                company=product.company,
-                product=product,
-                name=variant_option_data["name"],
+        option_names = [
+            variant_option_data["name"] for variant_option_data in variant_options_data
+        ]
+        variant_options = VariantOption.objects.filter(
+            company=product.company, product=product
+        )
+
+        duplicate_names = sorted(
+            {name for name in option_names if option_names.count(name) > 1}
+        )
+        if duplicate_names:
+            raise ValidationError(
+                {
+                    "variant_options_data": [
+                        f"Option names must be unique: {', '.join(duplicate_names)}."
+                    ]
+                }
             )
-            variant_option_ids.append(variant_option.id)
-            variant_values_data = variant_option_data.pop("values")
-            for value in variant_values_data:
-                VariantValue.objects.get_or_create(
+
+        option_renames = {
+            variant_option_data["uuid"]: variant_option_data["name"]
+            for variant_option_data in variant_options_data
+            if variant_option_data.get("uuid")
+        }
+        if option_renames:
+            option_renames = {
+                option_uuid: option_renames[option_uuid]
+                for option_uuid in variant_options.filter(
+                    uuid__in=option_renames
+                ).values_list("uuid", flat=True)
+            }
+        renamed_names = set(option_renames.values())
+        UtilService.bulk_soft_delete(
+            queryset=variant_options.exclude(uuid__in=option_renames).exclude(
+                name__in=[name for name in option_names if name not in renamed_names]
+            )
+        )
+        if option_renames:
+            self.rename_variant_options(
+                variant_options=variant_options, option_renames=option_renames
+            )
+
+        VariantOption.objects.bulk_create(
+            [
+                VariantOption(company=product.company, product=product, name=name)
+                for name in option_names
+            ],
+            ignore_conflicts=True,
+        )
+
+        option_ids = dict(
+            variant_options.filter(name__in=option_names).values_list("name", "id")
+        )
+
+        values = dict.fromkeys(
+            (option_ids[variant_option_data["name"]], value)
+            for variant_option_data in variant_options_data
+            for value in variant_option_data["values"]
+        )
+        VariantValue.objects.bulk_create(
+            [
+                VariantValue(
                     company=product.company,
                     product=product,
-                    option=variant_option,
+                    option_id=option_id,
                     value=value,
                 )
+                for option_id, value in values
+            ],
+            ignore_conflicts=True,
+        )
+
+        variant_values = VariantValue.objects.filter(
+            company=product.company, product=product
+        )
+        stale_value_ids = [
+            value_id
+            for value_id, option_id, value in variant_values.values_list(
+                "id", "option_id", "value"
+            )
+            if (option_id, value) not in values
+        ]
+        if stale_value_ids:
+            UtilService.bulk_soft_delete(
+                queryset=variant_values.filter(id__in=stale_value_ids)
+            )
+
+
+class VariantMatrix:
+    def __init__(self, *, option_values, lazy_threshold=None):
+        self.options = list(option_values)
+        self.values = [list(values) for values in option_values.values()]
+        self.option_names = " ".join([option.name for option in self.options])
+        if lazy_threshold is None:
+            lazy_threshold = settings.PRODUCT_VARIANTS_LAZY_THRESHOLD
+        self.is_lazy = self.count() > lazy_threshold
+
+    @cached_property
+    def value_positions(self):
+        return {
+            variant_value.id: (position, variant_value)
+            for position, values in enumerate(self.values)
+            for variant_value in values
+        }
+
+    def count(self):
+        if not self.values:
+            return 0
+        return prod(len(values) for values in self.values)
+
+    def __len__(self):
+        return self.count()
 
-        VariantOption.objects.filter(company=product.company, product=product).exclude(
-            id__in=variant_option_ids
-        ).delete()
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                self.get_combination(index=combination_index)
+                for combination_index in range(*index.indices(self.count()))
+            ]
+        if index < 0:
+            index += self.count()
+        if not 0 <= index < self.count():
+            raise IndexError("Combination index out of range")
+        return self.get_combination(index=index)
+
+    def get_name(self, *, combination):
+        return (
+            self.option_names
+            + " - "
+            + " ".join([variant_value.value for variant_value in combination])
+        )
+
+    def get_key(self, *, combination):
+        value_ids = ",".join(
+            sorted(str(variant_value.id) for variant_value in combination)
+        )
+        return hashlib.md5(value_ids.encode()).hexdigest()
+
+    def get_value_ids(self, *, combination):
+        return sorted(variant_value.id for variant_value in combination)
+
+    def get_combinations(self):
+        return (
+            combination
+            for combination in itertools_product(*self.values)
+            if combination
+        )
+
+    def get_combination(self, *, index):
+        combination = []
+        for values in reversed(self.values):
+            index, value_index = divmod(index, len(values))
+            combination.append(values[value_index])
+        return combination[::-1]
+
+    def find_combination_by_value_ids(self, *, value_ids):
+        if not self.values or len(value_ids) != len(self.values):
+            return None
+        combination = [None] * len(self.values)
+        for value_id in value_ids:
+            position, variant_value = self.value_positions.get(value_id, (None, None))
+            if position is None or combination[position] is not None:
+                return None
+            combination[position] = variant_value
+        return combination
+
+    def find_combination(self, *, name):
+        prefix = self.option_names + " - "
+        if not self.values or not name.startswith(prefix):
+            return None
+        return self.match_values(text=name[len(prefix) :], position=0)
+
+    def match_values(self, *, text, position):
+        for variant_value in self.values[position]:
+            if position == len(self.values) - 1:
+                if text == variant_value.value:
+                    return [variant_value]
+                continue
+            if not text.startswith(variant_value.value + " "):
+                continue
+            combination = self.match_values(
+                text=text[len(variant_value.value) + 1 :], position=position + 1
+            )
+            if combination is not None:
+                return [variant_value] + combination
+        return None
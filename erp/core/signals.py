@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django_softdelete.signals import post_restore, post_soft_delete
+
+from core.models import Company
+from core.pagination import CountCache
+from core.services import CompanyCache
+
+
+@receiver([post_save, post_delete])
+def invalidate_pagination_count(sender, instance, **kwargs):
+    company_id = getattr(instance, "company_id", None)
+    if company_id is not None:
+        CountCache.invalidate(model=sender, company_id=company_id)
+
+
+@receiver([post_save, post_delete], sender=Company)
+def invalidate_company_cache(sender, instance, **kwargs):
+    CompanyCache.invalidate(company=instance)
+
+
+@receiver([post_soft_delete, post_restore])
+def touch_modified(sender, instance, **kwargs):
+    # Soft delete and restore only save their own timestamps, bump modified so
+    # list validators can stay a plain Max("modified").
+    instance.modified = instance.deleted_at or instance.restored_at
+    sender.global_objects.filter(pk=instance.pk).update(modified=instance.modified)
@@ -1,10 +1,13 @@
 import logging
+import tempfile
 
+from django.test import override_settings
 from faker import Faker
 from rest_framework.test import APITestCase
 from rest_framework.reverse import reverse
 from authentication.models import CustomUser
-from core.models import Company
+from core.models import Company, Product
+from core.services import CompanyCache
 
 
 class BaseAPITestCase(APITestCase):
@@ -12,6 +15,7 @@ class BaseAPITestCase(APITestCase):
         super().setUp()
         self.fake = Faker("es_ES")
         self.logger = logging.getLogger("django.test")
+        CompanyCache.entries.clear()
 
         self.user = self._create_user(
             email="testuser@gmail.com", password="testuser@gmail.com"
@@ -33,6 +37,25 @@ class BaseAPITestCase(APITestCase):
     def _create_company(self, user):
         return Company.objects.create(user=user, name=self.fake.company())
 
+    def _create_product(self, **kwargs):
+        defaults = {
+            "company": self.company,
+            "name": self.fake.unique.word(),
+            "base_cost": 10,
+            "base_price": 20,
+            "minimum_sale_unit": 1,
+            "minimum_unit_price": 20,
+        }
+        return Product.objects.create(**{**defaults, **kwargs})
+
+    def _use_temporary_media_root(self, **kwargs):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name, **kwargs)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        return media_root.name
+
     def _get_access_token(self, email, password):
         response = self.client.post(
             reverse("token-obtain"), {"email": email, "password": password}
@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from core.models import Brand, Partner
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class BulkTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("partner-list")
+        self.partner = Partner.objects.create(company=self.company, name="existing")
+        self.other_partner = Partner.objects.create(
+            company=self.other_company, name="other"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID=self.company.uuid,
+        )
+
+    def test_bulk_create_writes_valid_items_and_reports_errors(self):
+        data = [
+            {"name": f"partner {index}", "is_customer": True} for index in range(50)
+        ]
+        data += [{"name": "existing"}, {"name": "partner 1"}, {"email": "x@x.com"}]
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(len(response.data["results"]), 50)
+        self.assertEqual(
+            [error["index"] for error in response.data["errors"]], [50, 51, 52]
+        )
+        self.assertIn("name", response.data["errors"][2]["errors"])
+        self.assertEqual(Partner.objects.filter(company=self.company).count(), 51)
+        self.assertLess(len(context.captured_queries), 10)
+
+    def test_bulk_create_returns_created_when_every_item_is_valid(self):
+        response = self.client.post(
+            reverse("brand-list"), [{"name": "a"}, {"name": "b"}], format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["errors"], [])
+        self.assertEqual(Brand.objects.filter(company=self.company).count(), 2)
+
+    def test_bulk_partial_update(self):
+        second = Partner.objects.create(company=self.company, name="second")
+        data = [
+            {"uuid": str(self.partner.uuid), "email": "existing@partner.test"},
+            {"uuid": str(second.uuid), "name": "existing"},
+            {"uuid": str(self.other_partner.uuid), "name": "stolen"},
+            {"uuid": "not-a-uuid", "name": "invalid"},
+        ]
+
+        response = self.client.patch(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(
+            [error["index"] for error in response.data["errors"]], [1, 2, 3]
+        )
+        self.partner.refresh_from_db()
+        self.other_partner.refresh_from_db()
+        self.assertEqual(self.partner.email, "existing@partner.test")
+        self.assertEqual(self.other_partner.name, "other")
+
+    def test_bulk_is_not_allowed_on_products(self):
+        response = self.client.patch(reverse("product-list"), [], format="json")
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
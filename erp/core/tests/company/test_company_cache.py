@@ -0,0 +1,71 @@
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from core.services import CompanyCache
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class CompanyCacheTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("brand-list")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID=self.company.uuid,
+        )
+
+    def get_company_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if '"core_company"."uuid" =' in query["sql"]
+        ]
+
+    def test_company_is_resolved_once_across_requests(self):
+        self.assertEqual(len(self.get_company_queries()), 1)
+        self.assertEqual(len(self.get_company_queries()), 0)
+
+    def test_cache_is_invalidated_on_save_and_delete(self):
+        self.get_company_queries()
+        self.company.name = "renamed"
+        self.company.save()
+        self.assertEqual(len(self.get_company_queries()), 1)
+
+        self.company.hard_delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_other_users_company_is_not_cached(self):
+        self.get_company_queries()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID=self.other_company.uuid,
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_expired_and_evicted_entries_are_dropped(self):
+        CompanyCache.set(user_id=1, company_uuid="a", company=self.company)
+        with mock.patch.object(CompanyCache, "max_size", 1):
+            CompanyCache.set(user_id=1, company_uuid="b", company=self.company)
+        self.assertIsNone(CompanyCache.get(user_id=1, company_uuid="a"))
+        self.assertIsNotNone(CompanyCache.get(user_id=1, company_uuid="b"))
+
+        with mock.patch.object(CompanyCache, "timeout", -1):
+            CompanyCache.set(user_id=1, company_uuid="c", company=self.company)
+        self.assertIsNone(CompanyCache.get(user_id=1, company_uuid="c"))
+
+    def test_malformed_company_uuid_is_not_found(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID="not-a-uuid",
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
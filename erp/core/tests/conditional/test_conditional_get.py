@@ -0,0 +1,83 @@
+from rest_framework import status
+from rest_framework.reverse import reverse
+from core.models import Brand, Product
+from core.services import UtilService
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class ConditionalGetTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.brand = Brand.objects.create(company=self.company, name="brand")
+        self.product = self._create_product(brand=self.brand)
+        self.list_url = reverse("product-list")
+        self.detail_url = reverse("product-detail", kwargs={"uuid": self.product.uuid})
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID=self.company.uuid,
+        )
+
+    def _get(self, *, url, **headers):
+        return self.client.get(url, **headers)
+
+    def test_list_returns_not_modified_for_matching_etag(self):
+        response = self._get(url=self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+        response = self._get(url=self.list_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_list_etag_changes_on_create_and_delete(self):
+        etag = self._get(url=self.list_url)["ETag"]
+
+        self._create_product()
+        response = self._get(url=self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response["ETag"]
+        self.product.delete()
+        response = self._get(url=self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+
+    def test_list_etag_changes_on_restore_and_bulk_delete(self):
+        self.product.delete()
+        etag = self._get(url=self.list_url)["ETag"]
+
+        self.product.restore()
+        response = self._get(url=self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+
+        etag = response["ETag"]
+        UtilService.bulk_soft_delete(
+            queryset=Product.objects.filter(pk=self.product.pk)
+        )
+        response = self._get(url=self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_depends_on_query_params(self):
+        etag = self._get(url=self.list_url)["ETag"]
+        response = self._get(
+            url=f"{self.list_url}?page_size=5", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_returns_not_modified_until_related_change(self):
+        response = self._get(url=self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+
+        response = self._get(url=self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self._get(url=self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.brand.name = "renamed brand"
+        self.brand.save()
+        response = self._get(url=self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["brand"]["name"], "renamed brand")
@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+from rest_framework import status
+from rest_framework.reverse import reverse
+from core.models import Brand, Partner
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class ExportTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.brand = Brand.objects.create(company=self.company, name="brand")
+        for index in range(5):
+            self._create_product(
+                brand=self.brand if index % 2 else None, name=f"product {index}"
+            )
+            Partner.objects.create(company=self.company, name=f"partner {index}")
+        Partner.objects.create(company=self.other_company, name="other partner")
+
+    def _export(self, *, url, data=None):
+        response = self._make_get_request(url=url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_partners_as_ndjson(self):
+        content = self._export(url=reverse("partner-export"))
+        rows = [json.loads(line) for line in content.splitlines()]
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["name"], "partner 4")
+        self.assertNotIn("company", rows[0])
+
+    def test_export_products_as_csv_with_filters(self):
+        content = self._export(
+            url=reverse("product-export"),
+            data={"export_format": "csv", "brand_name": "brand"},
+        )
+        rows = list(csv.DictReader(io.StringIO(content)))
+
+        self.assertEqual(len(rows), 2)
+        self.assertIn("brand.name", rows[0])
+        self.assertEqual({row["brand.name"] for row in rows}, {"brand"})
+        self.assertEqual(rows[0]["name"], "product 3")
+
+    def test_export_rejects_unknown_format(self):
+        response = self._make_get_request(
+            url=reverse("partner-export"), data={"export_format": "xml"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
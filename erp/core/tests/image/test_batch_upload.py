@@ -0,0 +1,107 @@
+import hashlib
+import io
+import os
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image as PilImage
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from core.models import Image
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class ImageBatchUploadTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = self._use_temporary_media_root()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID=self.company.uuid,
+        )
+        self.url = reverse("upload-images-batch")
+
+    def _get_file(self, *, color, name="photo.png"):
+        buffer = io.BytesIO()
+        PilImage.new("RGB", (16, 16), color).save(buffer, "PNG")
+        return SimpleUploadedFile(name, buffer.getvalue(), "image/png")
+
+    def test_batch_upload_creates_one_image_per_distinct_file(self):
+        files = [
+            self._get_file(color=(255, 0, 0)),
+            self._get_file(color=(0, 255, 0)),
+            self._get_file(color=(255, 0, 0)),
+        ]
+
+        with self.assertNumQueries(5):
+            response = self.client.post(self.url, {"files": files}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        results = response.data["results"]
+        self.assertEqual([result["index"] for result in results], [0, 1, 2])
+        self.assertEqual([result["created"] for result in results], [True, True, False])
+        self.assertEqual(results[0]["image"]["uuid"], results[2]["image"]["uuid"])
+        self.assertEqual(Image.objects.filter(company=self.company).count(), 2)
+
+    def test_batch_upload_reports_invalid_files_individually(self):
+        existing_uuid = self.client.post(
+            self.url, {"files": [self._get_file(color=(0, 0, 255))]}, format="multipart"
+        ).data["results"][0]["image"]["uuid"]
+        files = [
+            self._get_file(color=(0, 0, 255)),
+            SimpleUploadedFile("notes.txt", b"not an image", "text/plain"),
+        ]
+
+        response = self.client.post(self.url, {"files": files}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data["results"][0]["image"]["uuid"], existing_uuid)
+        self.assertFalse(response.data["results"][0]["created"])
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.assertEqual(response.data["errors"][0]["filename"], "notes.txt")
+        self.assertIn("url", response.data["errors"][0]["errors"])
+
+    def test_batch_upload_requires_files(self):
+        response = self.client.post(self.url, {}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_upload_to_another_users_company_is_not_found(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID=self.other_company.uuid,
+        )
+        response = self.client.post(
+            self.url, {"files": [self._get_file(color=(1, 2, 3))]}, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Image.objects.exists())
+
+    def test_batch_upload_reports_rows_lost_to_a_concurrent_upload(self):
+        file = self._get_file(color=(9, 9, 9))
+        content = file.read()
+        file.seek(0)
+        content_hash = hashlib.sha256(content).hexdigest()
+        bulk_create = Image.objects.bulk_create
+
+        def concurrent_bulk_create(images, **kwargs):
+            Image.objects.create(
+                company=self.company,
+                content_hash=content_hash,
+                url=SimpleUploadedFile(f"{content_hash}.png", content, "image/png"),
+            )
+            return bulk_create(images, **kwargs)
+
+        with mock.patch.object(
+            Image.objects, "bulk_create", side_effect=concurrent_bulk_create
+        ):
+            response = self.client.post(self.url, {"files": [file]}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(response.data["results"][0]["created"])
+        self.assertEqual(
+            os.listdir(os.path.join(self.media_root, "images")),
+            [f"{content_hash}.png"],
+        )
@@ -0,0 +1,108 @@
+import io
+import os
+
+from PIL import Image as PilImage
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from core.models import Image, ImageUpload
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class ChunkedImageUploadTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = self._use_temporary_media_root()
+
+        buffer = io.BytesIO()
+        PilImage.new("RGB", (64, 48), (0, 128, 255)).save(buffer, "PNG")
+        self.content = buffer.getvalue()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID=self.company.uuid,
+        )
+
+    def _init_upload(self):
+        response = self.client.post(
+            reverse("upload-image-chunks-list"),
+            {"filename": "photo.png", "size": len(self.content)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["uuid"]
+
+    def _put_chunk(self, *, upload_uuid, offset, chunk):
+        return self.client.put(
+            reverse("upload-image-chunks-detail", kwargs={"uuid": upload_uuid}),
+            data=chunk,
+            content_type="application/octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def _finalize(self, *, upload_uuid):
+        return self.client.post(
+            reverse("upload-image-chunks-finalize", kwargs={"uuid": upload_uuid})
+        )
+
+    def test_chunks_are_appended_and_finalized_into_an_image(self):
+        upload_uuid = self._init_upload()
+        middle = len(self.content) // 2
+
+        response = self._put_chunk(
+            upload_uuid=upload_uuid, offset=0, chunk=self.content[:middle]
+        )
+        self.assertEqual(response.data["offset"], middle)
+        response = self._put_chunk(
+            upload_uuid=upload_uuid, offset=middle, chunk=self.content[middle:]
+        )
+        self.assertEqual(response.data["offset"], len(self.content))
+
+        response = self._finalize(upload_uuid=upload_uuid)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        image = Image.objects.get(uuid=response.data["uuid"])
+        self.assertEqual(image.company, self.company)
+        with open(os.path.join(self.media_root, image.url.name), "rb") as file:
+            self.assertEqual(file.read(), self.content)
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(self.media_root, "uploads", f"{upload_uuid}.part")
+            )
+        )
+
+        response = self._finalize(upload_uuid=upload_uuid)
+        self.assertEqual(response.data["uuid"], str(image.uuid))
+
+    def test_resuming_from_a_wrong_offset_is_a_conflict(self):
+        upload_uuid = self._init_upload()
+        self._put_chunk(upload_uuid=upload_uuid, offset=0, chunk=self.content[:10])
+
+        response = self._put_chunk(
+            upload_uuid=upload_uuid, offset=0, chunk=self.content[:10]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        response = self.client.get(
+            reverse("upload-image-chunks-detail", kwargs={"uuid": upload_uuid})
+        )
+        self.assertEqual(response.data["offset"], 10)
+
+    def test_incomplete_upload_cannot_be_finalized(self):
+        upload_uuid = self._init_upload()
+        self._put_chunk(upload_uuid=upload_uuid, offset=0, chunk=self.content[:10])
+
+        response = self._finalize(upload_uuid=upload_uuid)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Image.objects.exists())
+
+    def test_invalid_image_is_rejected_on_finalize(self):
+        self.content = b"GIF89a" + b"\x00" * 64
+        upload_uuid = self._init_upload()
+        self._put_chunk(upload_uuid=upload_uuid, offset=0, chunk=self.content)
+
+        response = self._finalize(upload_uuid=upload_uuid)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("url", response.data)
+        self.assertIsNone(ImageUpload.objects.get(uuid=upload_uuid).image)
@@ -0,0 +1,101 @@
+import hashlib
+import io
+import os
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image as PilImage
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from core.models import Image
+from core.services import ImageDerivativeService
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class ImageDeduplicationTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = self._use_temporary_media_root()
+
+        buffer = io.BytesIO()
+        PilImage.new("RGB", (32, 32), (10, 20, 30)).save(buffer, "PNG")
+        self.content = buffer.getvalue()
+
+    def _upload(self, *, company, access_token=None):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {access_token or self.access_token}",
+            HTTP_X_COMPANY_UUID=company.uuid,
+        )
+        return self.client.post(
+            reverse("upload-images-list"),
+            {"url": SimpleUploadedFile("photo.png", self.content, "image/png")},
+            format="multipart",
+        )
+
+    def _get_stored_files(self):
+        return os.listdir(os.path.join(self.media_root, "images"))
+
+    def test_duplicate_upload_returns_the_existing_image(self):
+        first_response = self._upload(company=self.company)
+        second_response = self._upload(company=self.company)
+
+        self.assertEqual(first_response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(first_response.data["uuid"], second_response.data["uuid"])
+        content_hash = hashlib.sha256(self.content).hexdigest()
+        self.assertEqual(self._get_stored_files(), [f"{content_hash}.png"])
+        self.assertEqual(Image.objects.get().content_hash, content_hash)
+
+    def test_duplicates_are_scoped_to_the_company(self):
+        self._upload(company=self.company)
+        other_access_token = self._get_access_token(
+            email="testuser1@gmail.com", password="testuser1@gmail.com"
+        )
+        response = self._upload(
+            company=self.other_company, access_token=other_access_token
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Image.objects.count(), 2)
+
+    def test_upload_to_another_users_company_is_not_found(self):
+        response = self._upload(company=self.other_company)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Image.objects.exists())
+
+    def test_upload_requires_authentication(self):
+        response = self.client.post(
+            reverse("upload-images-list"),
+            {"url": SimpleUploadedFile("photo.png", self.content, "image/png")},
+            format="multipart",
+            HTTP_X_COMPANY_UUID=self.company.uuid,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_chunked_duplicate_returns_the_existing_image(self):
+        image_uuid = self._upload(company=self.company).data["uuid"]
+
+        response = self.client.post(
+            reverse("upload-image-chunks-list"),
+            {"filename": "copy.png", "size": len(self.content)},
+            format="json",
+        )
+        upload_uuid = response.data["uuid"]
+        self.client.put(
+            reverse("upload-image-chunks-detail", kwargs={"uuid": upload_uuid}),
+            data=self.content,
+            content_type="application/octet-stream",
+            HTTP_UPLOAD_OFFSET="0",
+        )
+        with mock.patch.object(ImageDerivativeService, "schedule") as schedule:
+            response = self.client.post(
+                reverse("upload-image-chunks-finalize", kwargs={"uuid": upload_uuid})
+            )
+
+        self.assertEqual(response.data["uuid"], image_uuid)
+        schedule.assert_not_called()
+        self.assertEqual(len(self._get_stored_files()), 1)
+        self.assertEqual(os.listdir(os.path.join(self.media_root, "uploads")), [])
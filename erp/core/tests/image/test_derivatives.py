@@ -0,0 +1,115 @@
+import os
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from PIL import Image as PilImage
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from core.models import Image, ProductImage
+from core.services import ImageDerivativeService
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class ImageDerivativeTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = self._use_temporary_media_root(
+            IMAGE_DERIVATIVES={
+                "thumbnail": {"size": [50, 50], "format": "JPEG"},
+                "webp": {"size": [200, 200], "format": "WEBP"},
+            },
+        )
+
+        os.makedirs(os.path.join(self.media_root, "images"))
+        PilImage.new("RGBA", (400, 300), (255, 0, 0, 128)).save(
+            os.path.join(self.media_root, "images", "photo.png")
+        )
+        self.image = Image.objects.create(company=self.company, url="images/photo.png")
+
+    def test_generate_renders_configured_derivatives(self):
+        ImageDerivativeService.generate(image=self.image)
+
+        self.image.refresh_from_db()
+        self.assertEqual(
+            self.image.derivatives,
+            {
+                "thumbnail": "images/derivatives/photo_thumbnail.jpg",
+                "webp": "images/derivatives/photo_webp.webp",
+            },
+        )
+        with PilImage.open(
+            os.path.join(self.media_root, self.image.derivatives["thumbnail"])
+        ) as thumbnail:
+            self.assertEqual(thumbnail.format, "JPEG")
+            self.assertEqual(thumbnail.size, (50, 38))
+
+    def test_product_list_exposes_thumbnail(self):
+        ImageDerivativeService.generate(image=self.image)
+        product = self._create_product()
+        ProductImage.objects.create(
+            company=self.company, product=product, image=self.image
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID=self.company.uuid,
+        )
+
+        response = self.client.get(reverse("product-list"))
+        thumbnail_url = response.data["results"][0]["thumbnail"]
+        self.assertEqual(
+            thumbnail_url,
+            reverse("media", kwargs={"name": "images/derivatives/photo_thumbnail.jpg"}),
+        )
+        self.assertEqual(self.client.get(thumbnail_url).status_code, status.HTTP_200_OK)
+
+        response = self.client.get(
+            reverse("product-detail", kwargs={"uuid": product.uuid})
+        )
+        self.assertEqual(
+            response.data["product_images"][0]["derivatives"]["webp"],
+            reverse("media", kwargs={"name": "images/derivatives/photo_webp.webp"}),
+        )
+
+    def test_saving_derivatives_invalidates_cached_products(self):
+        product = self._create_product()
+        ProductImage.objects.create(
+            company=self.company, product=product, image=self.image
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID=self.company.uuid,
+        )
+        detail_url = reverse("product-detail", kwargs={"uuid": product.uuid})
+        list_etag = self.client.get(reverse("product-list"))["ETag"]
+        detail_etag = self.client.get(detail_url)["ETag"]
+
+        ImageDerivativeService.generate(image=self.image)
+
+        response = self.client.get(
+            reverse("product-list"), HTTP_IF_NONE_MATCH=list_etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data["results"][0]["thumbnail"])
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def _schedule_with_broken_executor(self, *, executor):
+        with mock.patch.object(ImageDerivativeService, "executor", executor):
+            with self.assertLogs("core.services", level="ERROR"):
+                with self.captureOnCommitCallbacks(execute=True):
+                    ImageDerivativeService.schedule(image=self.image)
+            self.assertIsNone(ImageDerivativeService.executor)
+
+    def test_broken_pool_on_submit_is_reset_and_logged(self):
+        executor = mock.Mock()
+        executor.submit.side_effect = BrokenProcessPool()
+        self._schedule_with_broken_executor(executor=executor)
+
+    def test_broken_pool_in_a_worker_is_reset_and_logged(self):
+        future = Future()
+        future.set_exception(BrokenProcessPool())
+        executor = mock.Mock()
+        executor.submit.return_value = future
+        self._schedule_with_broken_executor(executor=executor)
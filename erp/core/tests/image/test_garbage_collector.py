@@ -0,0 +1,80 @@
+import io
+import os
+import time
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from core.models import Image, ImageUpload, ProductImage
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class ImageGarbageCollectorTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = self._use_temporary_media_root()
+        os.makedirs(os.path.join(self.media_root, "images"))
+        os.makedirs(os.path.join(self.media_root, "uploads"))
+
+        self.product = self._create_product()
+        self.linked_image = self._create_image(name="linked.png")
+        ProductImage.objects.create(
+            company=self.company, product=self.product, image=self.linked_image
+        )
+        self.orphaned_image = self._create_image(name="orphaned.png", in_use=True)
+        self.recent_image = self._create_image(name="recent.png", age=timedelta())
+        self.untracked_file = self._create_file(name="images/untracked.png")
+        self.image_upload = ImageUpload.objects.create(
+            company=self.company, filename="photo.png", size=10
+        )
+        ImageUpload.objects.filter(id=self.image_upload.id).update(
+            modified=timezone.now() - timedelta(days=2)
+        )
+        self._create_file(name=f"uploads/{self.image_upload.uuid}.part")
+
+    def _create_file(self, *, name, age=timedelta(days=2)):
+        path = os.path.join(self.media_root, name)
+        with open(path, "wb") as file:
+            file.write(b"content")
+        mtime = time.time() - age.total_seconds()
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def _create_image(self, *, name, in_use=False, age=timedelta(days=2)):
+        self._create_file(name=f"images/{name}", age=age)
+        image = Image.objects.create(
+            company=self.company, url=f"images/{name}", in_use=in_use
+        )
+        Image.objects.filter(id=image.id).update(created=timezone.now() - age)
+        return image
+
+    def _collect(self, *args):
+        stdout = io.StringIO()
+        call_command("collect_orphan_images", *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def _get_stored_files(self, directory):
+        return sorted(os.listdir(os.path.join(self.media_root, directory)))
+
+    def test_dry_run_reports_without_deleting(self):
+        output = self._collect("--dry-run")
+
+        self.assertIn("Would delete 1 orphaned images.", output)
+        self.assertIn("Would delete 1 abandoned uploads.", output)
+        self.assertEqual(Image.objects.count(), 3)
+        self.assertEqual(len(self._get_stored_files("images")), 4)
+
+    def test_collect_deletes_orphans_and_refreshes_in_use(self):
+        output = self._collect("--batch-size", "1")
+
+        self.assertIn("Deleted 1 orphaned images.", output)
+        self.assertIn("Deleted 1 untracked media files.", output)
+        self.assertEqual(
+            set(Image.objects.values_list("id", flat=True)),
+            {self.linked_image.id, self.recent_image.id},
+        )
+        self.assertTrue(Image.objects.get(id=self.linked_image.id).in_use)
+        self.assertEqual(self._get_stored_files("images"), ["linked.png", "recent.png"])
+        self.assertFalse(ImageUpload.global_objects.exists())
+        self.assertEqual(self._get_stored_files("uploads"), [])
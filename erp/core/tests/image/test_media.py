@@ -0,0 +1,80 @@
+import hashlib
+import os
+
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from core.models import Image
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class MediaViewTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = self._use_temporary_media_root(MEDIA_SERVE_BACKEND="")
+        os.makedirs(os.path.join(self.media_root, "images"))
+
+        self.content = bytes(range(256)) * 4
+        self.content_hash = hashlib.sha256(self.content).hexdigest()
+        self.name = f"images/{self.content_hash}.png"
+        with open(os.path.join(self.media_root, self.name), "wb") as file:
+            file.write(self.content)
+        self.image = Image.objects.create(
+            company=self.company, url=self.name, content_hash=self.content_hash
+        )
+        self.url = reverse("media", kwargs={"name": self.name})
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID=self.company.uuid,
+        )
+
+    def test_file_is_served_with_immutable_cache_headers(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+    def test_range_requests_return_partial_content(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=10-19")
+
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(response.streaming_content), self.content[10:20])
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(self.content)}")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(response.streaming_content), self.content[-5:])
+
+    def test_unsatisfiable_range_is_rejected(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=5000-")
+
+        self.assertEqual(
+            response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.content)}")
+
+    def test_images_of_other_companies_are_not_found(self):
+        self.image.company = self.other_company
+        self.image.save()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unauthenticated_requests_are_rejected(self):
+        self.client.credentials()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(MEDIA_SERVE_BACKEND="x-accel-redirect")
+    def test_transfer_is_delegated_to_the_front_end_server(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.name}")
+        self.assertEqual(response.content, b"")
@@ -0,0 +1,67 @@
+import io
+import struct
+import zlib
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from PIL import Image as PilImage
+
+from core.serializers import ImageSerializer, ImageUploadField
+
+
+class ImageValidationTestCase(SimpleTestCase):
+    def _get_png(self, *, size=(20, 10)):
+        buffer = io.BytesIO()
+        PilImage.new("RGB", size).save(buffer, "PNG")
+        return buffer.getvalue()
+
+    def _get_png_header(self, *, width, height):
+        ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+        return (
+            b"\x89PNG\r\n\x1a\n"
+            + struct.pack(">I", len(ihdr))
+            + b"IHDR"
+            + ihdr
+            + struct.pack(">I", zlib.crc32(b"IHDR" + ihdr))
+            + struct.pack(">I", 0)
+            + b"IDAT"
+            + struct.pack(">I", zlib.crc32(b"IDAT"))
+        )
+
+    def _validate(self, *, content, name="photo.png"):
+        serializer = ImageSerializer(
+            data={"url": SimpleUploadedFile(name, content, content_type="image/png")}
+        )
+        serializer.is_valid()
+        return serializer
+
+    def test_valid_image_is_accepted(self):
+        serializer = self._validate(content=self._get_png())
+
+        self.assertNotIn("url", serializer.errors)
+        self.assertEqual(serializer.validated_data["url"].image.size, (20, 10))
+
+    def test_oversized_upload_is_rejected_before_decoding(self):
+        content = b"GIF89a" + b"\x00" * ImageUploadField.max_image_size
+
+        serializer = self._validate(content=content)
+
+        self.assertIn("Image size exceeds", serializer.errors["url"][0])
+
+    def test_unknown_signature_is_rejected(self):
+        serializer = self._validate(content=b"GIF89a" + b"\x00" * 32, name="photo.gif")
+
+        self.assertIn("Unsupported image format", serializer.errors["url"][0])
+
+    def test_decompression_bomb_is_rejected_from_headers(self):
+        for width, height in [(6000, 6000), (20000, 20000)]:
+            content = self._get_png_header(width=width, height=height)
+
+            serializer = self._validate(content=content)
+
+            self.assertIn("Image dimensions exceed", serializer.errors["url"][0])
+
+    def test_truncated_image_is_rejected(self):
+        serializer = self._validate(content=b"\x89PNG\r\n\x1a\n" + b"\x00" * 4)
+
+        self.assertIn("Error processing image", serializer.errors["url"][0])
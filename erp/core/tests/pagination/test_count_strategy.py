@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from core.models import Brand, Partner
+from core.pagination import CountStrategy, CountStrategyPaginator
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class CountStrategyTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.url = reverse("partner-list")
+        for index in range(15):
+            Partner.objects.create(company=self.company, name=f"partner {index}")
+
+    def _get_list(self, *, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self._make_get_request(url=self.url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        count_queries = [
+            query for query in context.captured_queries if "COUNT(" in query["sql"]
+        ]
+        return response.data, len(count_queries)
+
+    def test_cached_count_skips_count_query_until_a_write(self):
+        data, count_queries = self._get_list()
+        self.assertEqual(data["count"], 15)
+        self.assertTrue(data["count_is_exact"])
+        self.assertEqual(count_queries, 1)
+
+        data, count_queries = self._get_list()
+        self.assertEqual(data["count"], 15)
+        self.assertFalse(data["count_is_exact"])
+        self.assertEqual(count_queries, 0, "Expected the count to come from cache")
+        self.assertEqual(len(data["results"]), 10)
+
+        Partner.objects.create(company=self.company, name="new partner")
+        data, count_queries = self._get_list()
+        self.assertEqual(data["count"], 16)
+        self.assertEqual(count_queries, 1, "Expected writes to invalidate the count")
+
+    def test_cached_count_is_keyed_by_filters(self):
+        self._get_list()
+        data, count_queries = self._get_list(data={"name": "partner 1"})
+        self.assertEqual(data["count"], 6)
+        self.assertEqual(count_queries, 1)
+
+    def test_estimated_count_is_flagged_as_not_exact(self):
+        queryset = Partner.objects.filter(company=self.company).order_by("-id")
+        paginator = CountStrategyPaginator(
+            queryset, 10, count_strategy=CountStrategy.ESTIMATED
+        )
+        paginator.estimate_threshold = 0
+
+        self.assertGreater(paginator.count, 0)
+        self.assertFalse(paginator.count_is_exact)
+        self.assertEqual(len(paginator.page(1).object_list), 10)
+
+    def test_exact_count_is_the_default(self):
+        Brand.objects.create(company=self.company, name="brand")
+        response = self._make_get_request(url=reverse("brand-list"))
+        self.assertEqual(response.data["count"], 1)
+        self.assertTrue(response.data["count_is_exact"])
@@ -0,0 +1,58 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from core.models import Brand
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class CursorPaginationTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("brand-list")
+        self.brands = [
+            Brand.objects.create(company=self.company, name=f"brand {index:02}")
+            for index in range(25)
+        ]
+
+    def _collect_pages(self, *, data):
+        results = []
+        url = self.url
+        while url:
+            response = self._make_get_request(url=url, data=data)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            self.assertNotIn("num_pages", response.data)
+            results.extend(item["name"] for item in response.data["results"])
+            url, data = response.data["next"], None
+        return results
+
+    def test_cursor_pagination_walks_every_item_by_id(self):
+        results = self._collect_pages(data={"pagination": "cursor"})
+        self.assertEqual(results, [brand.name for brand in reversed(self.brands)])
+
+    def test_cursor_pagination_supports_allowed_ordering(self):
+        results = self._collect_pages(
+            data={"pagination": "cursor", "ordering": "name", "page_size": 7}
+        )
+        self.assertEqual(results, sorted(brand.name for brand in self.brands))
+
+    def test_cursor_pagination_ignores_ordering_missing_from_the_model(self):
+        response = self._make_get_request(
+            url=reverse("upload-image-chunks-list"),
+            data={"pagination": "cursor", "ordering": "name"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_cursor_pagination_does_not_count(self):
+        with CaptureQueriesContext(connection) as context:
+            self._make_get_request(url=self.url, data={"pagination": "cursor"})
+        self.assertFalse(
+            any("COUNT(" in query["sql"] for query in context.captured_queries),
+            "Expected no COUNT query in cursor mode",
+        )
+
+    def test_page_number_pagination_is_the_default(self):
+        response = self._make_get_request(url=self.url)
+        self.assertEqual(response.data["count"], 25)
+        self.assertEqual(response.data["num_pages"], 3)
@@ -0,0 +1,86 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from core.models import (
+    Image,
+    ProductImage,
+    ProductVariant,
+    VariantOption,
+    VariantValue,
+)
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class DetailQueriesTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.small_product = self._create_variant_product(options=1, values=1, images=1)
+        self.large_product = self._create_variant_product(
+            options=5, values=4, images=12
+        )
+
+    def _create_variant_product(self, *, options, values, images):
+        product = self._create_product(has_variants=True)
+        for option_index in range(options):
+            option = VariantOption.objects.create(
+                company=self.company, product=product, name=f"option {option_index}"
+            )
+            for value_index in range(values):
+                VariantValue.objects.create(
+                    company=self.company,
+                    product=product,
+                    option=option,
+                    value=f"value {value_index}",
+                )
+            ProductVariant.objects.create(
+                company=self.company,
+                product=product,
+                name=f"variant {option_index}",
+                cost=0,
+                price=0,
+                stock_quantity=0,
+            )
+        for image_index in range(images):
+            image = Image.objects.create(
+                company=self.company, url=f"images/image{image_index}.png"
+            )
+            ProductImage.objects.create(
+                company=self.company, product=product, image=image
+            )
+        return product
+
+    def _count_detail_queries(self, *, product, data=None):
+        url = reverse("product-detail", kwargs={"uuid": product.uuid})
+        with CaptureQueriesContext(connection) as context:
+            response = self._make_get_request(url=url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response.data
+
+    def test_detail_query_count_does_not_grow_with_related_rows(self):
+        self._count_detail_queries(product=self.small_product)
+        small_queries, _ = self._count_detail_queries(product=self.small_product)
+        large_queries, data = self._count_detail_queries(product=self.large_product)
+
+        self.assertEqual(
+            small_queries,
+            large_queries,
+            "Expected detail query count to stay constant",
+        )
+        self.assertEqual(len(data["variant_options"]), 5)
+        self.assertEqual(len(data["variant_options"][0]["values"]), 4)
+        self.assertEqual(len(data["product_images"]), 12)
+        self.assertEqual(data["variant_summary"]["count"], 5)
+
+    def test_sparse_variant_summary_keeps_its_prefetch(self):
+        data = {"fields": "uuid,variant_summary"}
+        self._count_detail_queries(product=self.small_product, data=data)
+        small_queries, _ = self._count_detail_queries(
+            product=self.small_product, data=data
+        )
+        large_queries, response_data = self._count_detail_queries(
+            product=self.large_product, data=data
+        )
+
+        self.assertEqual(small_queries, large_queries)
+        self.assertEqual(set(response_data), {"uuid", "variant_summary"})
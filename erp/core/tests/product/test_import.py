@@ -0,0 +1,88 @@
+import json
+import tempfile
+from io import StringIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.reverse import reverse
+from core.models import Brand, Product
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class ImportTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.brand = Brand.objects.create(company=self.company, name="brand")
+        self.other_brand = Brand.objects.create(
+            company=self.other_company, name="other brand"
+        )
+        self._create_product(name="existing")
+
+    def _get_row(self, *, name, **kwargs):
+        return {
+            "name": name,
+            "sku": f"SKU-{name}",
+            "base_cost": "10.00",
+            "base_price": "20.00",
+            "minimum_sale_unit": "1.000",
+            "minimum_unit_price": "20.00",
+            **kwargs,
+        }
+
+    def test_import_csv_reports_errors_per_row(self):
+        content = "\n".join(
+            [
+                "name,sku,base_cost,base_price,minimum_sale_unit,minimum_unit_price,brand_uuid",
+                f"drill,DR-1,10,20,1,20,{self.brand.uuid}",
+                "hammer,,10,20,1,20,",
+                "existing,EX-1,10,20,1,20,",
+                "drill,DR-2,10,20,1,20,",
+                f"saw,SW-1,10,20,1,20,{self.other_brand.uuid}",
+                "level,LV-1,abc,20,1,20,",
+            ]
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID=self.company.uuid,
+        )
+        response = self.client.post(
+            reverse("product-import"),
+            {"file": SimpleUploadedFile("products.csv", content.encode())},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 2)
+        errors = {error["row"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(set(errors), {3, 4, 5, 6})
+        self.assertIn("name", errors[3])
+        self.assertIn("name", errors[4])
+        self.assertIn("brand_uuid", errors[5])
+        self.assertIn("base_cost", errors[6])
+
+        drill = Product.objects.get(company=self.company, name="drill")
+        self.assertEqual(drill.brand, self.brand)
+        self.assertEqual(drill.sku, "DR-1")
+        self.assertIsNone(Product.objects.get(name="hammer").sku)
+
+    def test_import_command_reads_ndjson_in_batches(self):
+        rows = [self._get_row(name=f"product {index}") for index in range(7)]
+        rows.append(self._get_row(name="product 1"))
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as file:
+            file.write("\n".join(json.dumps(row) for row in rows) + "\nnot json\n")
+            file.flush()
+
+            stdout, stderr = StringIO(), StringIO()
+            call_command(
+                "import_products",
+                str(self.company.uuid),
+                file.name,
+                "--batch-size=3",
+                stdout=stdout,
+                stderr=stderr,
+            )
+
+        self.assertIn("Imported 7 products (2 rows with errors)", stdout.getvalue())
+        self.assertIn("Row 8", stderr.getvalue())
+        self.assertIn("Row 9", stderr.getvalue())
+        self.assertEqual(Product.objects.filter(company=self.company).count(), 8)
@@ -0,0 +1,80 @@
+from rest_framework.exceptions import ValidationError
+
+from core.models import Image, ProductImage
+from core.services import ProductImageService
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class ProductImageServiceTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.product = self._create_product()
+        self.images = [
+            Image.objects.create(company=self.company, url=f"images/image{index}.png")
+            for index in range(4)
+        ]
+
+    def _get_linked_image_ids(self):
+        return set(
+            ProductImage.objects.filter(product=self.product).values_list(
+                "image_id", flat=True
+            )
+        )
+
+    def test_create_links_images_and_marks_them_in_use(self):
+        images_data = [image.uuid for image in self.images]
+        with self.assertNumQueries(6):
+            ProductImageService.create(product=self.product, images_data=images_data)
+
+        self.assertEqual(
+            self._get_linked_image_ids(), {image.id for image in self.images}
+        )
+        self.assertEqual(Image.objects.filter(in_use=True).count(), 4)
+
+    def test_create_only_touches_changed_links(self):
+        ProductImageService.create(
+            product=self.product, images_data=[image.uuid for image in self.images[:3]]
+        )
+        kept_link_ids = set(
+            ProductImage.objects.filter(
+                product=self.product, image__in=self.images[1:3]
+            ).values_list("id", flat=True)
+        )
+
+        ProductImageService.create(
+            product=self.product, images_data=[image.uuid for image in self.images[1:]]
+        )
+
+        self.assertEqual(
+            self._get_linked_image_ids(), {image.id for image in self.images[1:]}
+        )
+        self.assertTrue(
+            kept_link_ids
+            <= set(
+                ProductImage.objects.filter(product=self.product).values_list(
+                    "id", flat=True
+                )
+            )
+        )
+        self.assertFalse(Image.objects.get(id=self.images[0].id).in_use)
+        self.assertTrue(Image.objects.get(id=self.images[3].id).in_use)
+
+    def test_create_runs_no_writes_when_links_are_unchanged(self):
+        images_data = [image.uuid for image in self.images]
+        ProductImageService.create(product=self.product, images_data=images_data)
+
+        with self.assertNumQueries(4):
+            ProductImageService.create(product=self.product, images_data=images_data)
+
+    def test_create_rejects_images_of_other_companies(self):
+        other_image = Image.objects.create(
+            company=self.other_company, url="images/other.png"
+        )
+
+        with self.assertRaises(ValidationError) as context:
+            ProductImageService.create(
+                product=self.product, images_data=[other_image.uuid]
+            )
+
+        self.assertIn(str(other_image.uuid), context.exception.detail["images_data"][0])
+        self.assertFalse(ProductImage.objects.filter(product=self.product).exists())
@@ -0,0 +1,43 @@
+from django.http import Http404
+
+from core.models import Brand, Category, UnitOfMeasure
+from core.serializers import CategorySerializer
+from core.services import CategoryService, ProductService
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class RelatedUuidTestCase(BaseAPITestCase):
+    def test_product_rejects_another_companys_brand_and_unit(self):
+        brand = Brand.objects.create(company=self.other_company, name="brand")
+        unit_of_measure = UnitOfMeasure.objects.create(
+            company=self.other_company, name="unit"
+        )
+
+        for key, uuid in [
+            ("brand_uuid", brand.uuid),
+            ("unit_of_measure_uuid", unit_of_measure.uuid),
+        ]:
+            with self.subTest(key=key), self.assertRaises(Http404):
+                ProductService().set_custom_data(
+                    validated_data={"company": self.company, key: uuid}
+                )
+
+    def test_product_resolves_its_own_companys_brand(self):
+        brand = Brand.objects.create(company=self.company, name="brand")
+
+        validated_data = ProductService().set_custom_data(
+            validated_data={"company": self.company, "brand_uuid": brand.uuid}
+        )
+
+        self.assertEqual(validated_data["brand"], brand)
+        self.assertIsNone(validated_data["unit_of_measure"])
+
+    def test_category_rejects_another_companys_parent(self):
+        parent = Category.objects.create(company=self.other_company, name="parent")
+        serializer = CategorySerializer(
+            data={"name": "child", "parent_uuid": parent.uuid}
+        )
+
+        with self.assertRaises(Http404):
+            CategoryService.create(company=self.company, serializer=serializer)
+        self.assertFalse(Category.objects.filter(company=self.company).exists())
@@ -0,0 +1,81 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from core.models import Brand, Image, ProductImage, UnitOfMeasure
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class SparseFieldsTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.product = self._create_product(
+            brand=Brand.objects.create(company=self.company, name="brand"),
+            unit_of_measure=UnitOfMeasure.objects.create(
+                company=self.company, name="unit", abbreviation="u"
+            ),
+            description=self.fake.paragraph(),
+        )
+
+    def _get(self, *, url, data):
+        with CaptureQueriesContext(connection) as context:
+            response = self._make_get_request(url=url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        product_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if 'FROM "core_product"' in query["sql"]
+        ]
+        return response.data, product_queries, len(context.captured_queries)
+
+    def test_list_fields_prunes_serializer_and_query(self):
+        data, product_queries, _ = self._get(
+            url=reverse("product-list"), data={"fields": "uuid,name,base_price"}
+        )
+
+        self.assertEqual(set(data["results"][0]), {"uuid", "name", "base_price"})
+        self.assertEqual(data["results"][0]["name"], self.product.name)
+        for sql in product_queries:
+            self.assertNotIn("description", sql)
+            self.assertNotIn("JOIN", sql)
+
+    def test_list_omit_keeps_needed_joins(self):
+        data, product_queries, _ = self._get(
+            url=reverse("product-list"), data={"omit": "description,unit_of_measure"}
+        )
+
+        result = data["results"][0]
+        self.assertNotIn("description", result)
+        self.assertNotIn("unit_of_measure", result)
+        self.assertEqual(result["brand"]["name"], "brand")
+        self.assertIn("core_brand", product_queries[-1])
+        self.assertNotIn("core_unitofmeasure", product_queries[-1])
+
+    def test_detail_fields_skips_unrequested_prefetches(self):
+        url = reverse("product-detail", kwargs={"uuid": self.product.uuid})
+        self._get(url=url, data=None)
+        _, _, full_queries = self._get(url=url, data=None)
+        data, _, sparse_queries = self._get(url=url, data={"fields": "uuid,name"})
+
+        self.assertEqual(set(data), {"uuid", "name"})
+        self.assertEqual(full_queries - sparse_queries, 3)
+
+    def test_list_method_field_keeps_its_prefetch(self):
+        url = reverse("product-list")
+        data = {"fields": "uuid,thumbnail"}
+        self._get(url=url, data=data)
+        _, _, single_queries = self._get(url=url, data=data)
+        for index in range(3):
+            product = self._create_product(name=f"{self.product.name}{index}")
+            image = Image.objects.create(
+                company=self.company, url=f"images/image{index}.png"
+            )
+            ProductImage.objects.create(
+                company=self.company, product=product, image=image
+            )
+
+        self._get(url=url, data=data)
+        response_data, _, multiple_queries = self._get(url=url, data=data)
+
+        self.assertEqual(set(response_data["results"][0]), {"uuid", "thumbnail"})
+        self.assertEqual(single_queries, multiple_queries)
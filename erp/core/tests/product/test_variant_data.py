@@ -0,0 +1,50 @@
+from decimal import Decimal
+from rest_framework.exceptions import ValidationError
+from core.models import ProductVariant
+from core.services import ProductVariantService
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class VariantDataTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.product = self._create_product()
+        self.product_variant_service = ProductVariantService()
+        self.product_variant_service.create(
+            product=self.product,
+            variant_options_data=[{"name": "Size", "values": ["S", "M", "L"]}],
+        )
+
+    def _get_variant_data(self, *, name):
+        return {"name": name, "sku": f"SKU {name}", "cost": "5.00", "price": "9.90"}
+
+    def test_set_product_variants_data_updates_in_bulk(self):
+        product_variants_data = [
+            self._get_variant_data(name=f"Size - {size}") for size in ["S", "M", "L"]
+        ]
+        with self.assertNumQueries(4):
+            self.product_variant_service.set_product_variants_data(
+                product=self.product, product_variants_data=product_variants_data
+            )
+
+        for product_variant in ProductVariant.objects.filter(product=self.product):
+            self.assertEqual(product_variant.sku, f"SKU {product_variant.name}")
+            self.assertEqual(product_variant.cost, Decimal("5.00"))
+            self.assertEqual(product_variant.price, Decimal("9.90"))
+
+    def test_set_product_variants_data_reports_every_unknown_name(self):
+        product_variants_data = [
+            self._get_variant_data(name="Size - S"),
+            self._get_variant_data(name="Size - XL"),
+            self._get_variant_data(name="Size - XXL"),
+        ]
+        with self.assertRaises(ValidationError) as context:
+            self.product_variant_service.set_product_variants_data(
+                product=self.product, product_variants_data=product_variants_data
+            )
+
+        errors = context.exception.detail["product_variants_data"]
+        self.assertEqual(len(errors), 2)
+        self.assertIn("Size - XL", errors[0])
+        self.assertIn("Size - XXL", errors[1])
+        self.assertIsNone(ProductVariant.objects.get(name="Size - S").sku)
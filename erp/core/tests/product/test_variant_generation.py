@@ -0,0 +1,56 @@
+from core.models import ProductVariant, VariantOption, VariantValue
+from core.services import ProductVariantService
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class VariantGenerationTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.product = self._create_product()
+        for option_index in range(4):
+            option = VariantOption.objects.create(
+                company=self.company,
+                product=self.product,
+                name=f"option{option_index}",
+            )
+            for value_index in range(6):
+                VariantValue.objects.create(
+                    company=self.company,
+                    product=self.product,
+                    option=option,
+                    value=f"value{value_index}",
+                )
+
+    def _get_variants(self):
+        return ProductVariant.objects.filter(company=self.company, product=self.product)
+
+    def test_generate_product_variants_runs_constant_queries(self):
+        with self.assertNumQueries(3):
+            count = ProductVariantService().generate_product_variants(
+                product=self.product
+            )
+
+        self.assertEqual(count, 6**4)
+        self.assertEqual(self._get_variants().count(), 6**4)
+        self.assertIn(
+            "option0 option1 option2 option3 - value0 value1 value2 value3",
+            self._get_variants().values_list("name", flat=True),
+        )
+
+    def test_generate_product_variants_keeps_existing_and_removes_stale(self):
+        product_variant_service = ProductVariantService()
+        product_variant_service.generate_product_variants(product=self.product)
+        kept_variant = self._get_variants().get(
+            name="option0 option1 option2 option3 - value0 value0 value0 value0"
+        )
+
+        VariantValue.objects.filter(value="value5", option__name="option3").delete()
+        with self.assertNumQueries(4):
+            count = product_variant_service.generate_product_variants(
+                product=self.product
+            )
+
+        self.assertEqual(count, 6**3 * 5)
+        self.assertEqual(self._get_variants().count(), 6**3 * 5)
+        self.assertTrue(self._get_variants().filter(pk=kept_variant.pk).exists())
+        self.assertEqual(ProductVariant.deleted_objects.count(), 6**3)
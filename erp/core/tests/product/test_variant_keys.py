@@ -0,0 +1,140 @@
+from rest_framework.exceptions import ValidationError
+
+from core.models import ProductVariant, VariantOption
+from core.services import ProductVariantService
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class VariantKeyTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.product = self._create_product()
+        self.product_variant_service = ProductVariantService()
+        self.product_variant_service.create(
+            product=self.product,
+            variant_options_data=[
+                {"name": "Color", "values": ["Red", "Blue"]},
+                {"name": "Size", "values": ["S", "M"]},
+            ],
+        )
+
+    def _get_variants(self):
+        return ProductVariant.objects.filter(company=self.company, product=self.product)
+
+    def test_variants_are_keyed_by_combination(self):
+        combination_keys = list(
+            self._get_variants().values_list("combination_key", flat=True)
+        )
+
+        self.assertEqual(len(combination_keys), 4)
+        self.assertEqual(len(set(combination_keys)), 4)
+        self.assertTrue(all(len(key) == 32 for key in combination_keys))
+
+    def test_renaming_an_option_keeps_its_variants(self):
+        variant_ids = set(self._get_variants().values_list("id", flat=True))
+        color = VariantOption.objects.get(product=self.product, name="Color")
+
+        self.product_variant_service.create(
+            product=self.product,
+            variant_options_data=[
+                {"uuid": color.uuid, "name": "Colour", "values": ["Blue", "Red"]},
+                {"name": "Size", "values": ["M", "S"]},
+            ],
+        )
+
+        self.assertEqual(
+            set(self._get_variants().values_list("id", flat=True)), variant_ids
+        )
+        self.assertEqual(
+            set(self._get_variants().values_list("name", flat=True)),
+            {
+                "Colour Size - Red S",
+                "Colour Size - Red M",
+                "Colour Size - Blue S",
+                "Colour Size - Blue M",
+            },
+        )
+
+    def test_removing_a_value_only_drops_its_variants(self):
+        kept_ids = set(
+            self._get_variants()
+            .filter(name__contains="Red")
+            .values_list("id", flat=True)
+        )
+
+        self.product_variant_service.create(
+            product=self.product,
+            variant_options_data=[
+                {"name": "Color", "values": ["Red"]},
+                {"name": "Size", "values": ["S", "M"]},
+            ],
+        )
+
+        self.assertEqual(
+            set(self._get_variants().values_list("id", flat=True)), kept_ids
+        )
+
+    def test_swapping_option_names_by_uuid(self):
+        color = VariantOption.objects.get(product=self.product, name="Color")
+        size = VariantOption.objects.get(product=self.product, name="Size")
+
+        self.product_variant_service.create(
+            product=self.product,
+            variant_options_data=[
+                {"uuid": color.uuid, "name": "Size", "values": ["Red", "Blue"]},
+                {"uuid": size.uuid, "name": "Color", "values": ["S", "M"]},
+            ],
+        )
+
+        self.assertEqual(
+            dict(
+                VariantOption.objects.filter(product=self.product).values_list(
+                    "uuid", "name"
+                )
+            ),
+            {color.uuid: "Size", size.uuid: "Color"},
+        )
+        self.assertEqual(self._get_variants().count(), 4)
+
+    def test_duplicate_option_names_are_rejected(self):
+        color = VariantOption.objects.get(product=self.product, name="Color")
+
+        with self.assertRaises(ValidationError):
+            self.product_variant_service.create(
+                product=self.product,
+                variant_options_data=[
+                    {"uuid": color.uuid, "name": "Size", "values": ["Red"]},
+                    {"name": "Size", "values": ["S"]},
+                ],
+            )
+
+        self.assertEqual(
+            set(
+                VariantOption.objects.filter(product=self.product).values_list(
+                    "name", flat=True
+                )
+            ),
+            {"Color", "Size"},
+        )
+
+    def test_legacy_variants_without_a_key_are_matched_by_name(self):
+        self._get_variants().update(combination_key=None, variant_value_ids=[])
+        legacy_id = self._get_variants().get(name="Color Size - Red S").id
+        self._get_variants().exclude(id=legacy_id).delete()
+        for name in ["Old 1", "Old 2", "Old 3"]:
+            ProductVariant.objects.create(
+                company=self.company,
+                product=self.product,
+                name=name,
+                cost=0,
+                price=0,
+                stock_quantity=0,
+            )
+
+        self.product_variant_service.generate_product_variants(product=self.product)
+
+        self.assertEqual(self._get_variants().count(), 4)
+        self.assertFalse(self._get_variants().filter(name__startswith="Old").exists())
+        legacy_variant = self._get_variants().get(id=legacy_id)
+        self.assertEqual(len(legacy_variant.combination_key), 32)
+        self.assertEqual(len(legacy_variant.variant_value_ids), 2)
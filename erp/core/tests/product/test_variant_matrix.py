@@ -0,0 +1,182 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.reverse import reverse
+
+from core.models import ProductVariant, VariantOption
+from core.services import ProductVariantService, VariantMatrix
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+@override_settings(PRODUCT_VARIANTS_LAZY_THRESHOLD=10)
+class VariantMatrixTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.product = self._create_product()
+        self.product_variant_service = ProductVariantService()
+        self.product_variant_service.create(
+            product=self.product,
+            variant_options_data=[
+                {"name": "Size", "values": ["S", "M", "L"]},
+                {"name": "Color", "values": ["Dark blue", "Red", "Dark"]},
+                {"name": "Fit", "values": ["Slim", "Regular"]},
+            ],
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID=self.company.uuid,
+        )
+        self.url = reverse("product-variant-matrix", kwargs={"uuid": self.product.uuid})
+
+    def _get_variants(self):
+        return ProductVariant.objects.filter(company=self.company, product=self.product)
+
+    def test_lazy_matrix_does_not_materialize_variants(self):
+        self.assertFalse(self._get_variants().exists())
+
+    def test_variant_matrix_is_paginated_virtually(self):
+        response = self.client.get(self.url, {"page": 2, "page_size": 5})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 18)
+        self.assertEqual(
+            [row["name"] for row in response.data["results"]],
+            [
+                "Size Color Fit - S Dark Regular",
+                "Size Color Fit - M Dark blue Slim",
+                "Size Color Fit - M Dark blue Regular",
+                "Size Color Fit - M Red Slim",
+                "Size Color Fit - M Red Regular",
+            ],
+        )
+        self.assertIsNone(response.data["results"][0]["uuid"])
+        self.assertEqual(
+            response.data["results"][0]["values"], ["S", "Dark", "Regular"]
+        )
+
+    def test_setting_variant_data_materializes_only_that_combination(self):
+        self.product_variant_service.set_product_variants_data(
+            product=self.product,
+            product_variants_data=[
+                {
+                    "name": "Size Color Fit - L Dark blue Slim",
+                    "sku": "SKU-L",
+                    "cost": "5.00",
+                    "price": "9.90",
+                }
+            ],
+        )
+
+        product_variant = self._get_variants().get()
+        self.assertEqual(product_variant.sku, "SKU-L")
+
+        response = self.client.get(self.url, {"page": 3, "page_size": 5})
+        row = response.data["results"][2]
+        self.assertEqual(row["uuid"], str(product_variant.uuid))
+        self.assertEqual(row["price"], "9.90")
+        self.assertEqual(Decimal(response.data["results"][0]["price"]), 0)
+
+    def test_setting_variant_data_rejects_unknown_combinations(self):
+        with self.assertRaises(ValidationError):
+            self.product_variant_service.set_product_variants_data(
+                product=self.product,
+                product_variants_data=[
+                    {
+                        "name": "Size Color Fit - XL Dark blue Slim",
+                        "sku": "SKU-XL",
+                        "cost": "5.00",
+                        "price": "9.90",
+                    }
+                ],
+            )
+
+        self.assertFalse(self._get_variants().exists())
+
+    def test_regeneration_removes_only_stale_materialized_variants(self):
+        self.product_variant_service.set_product_variants_data(
+            product=self.product,
+            product_variants_data=[
+                {"name": name, "sku": name, "cost": "1.00", "price": "2.00"}
+                for name in [
+                    "Size Color Fit - S Red Slim",
+                    "Size Color Fit - L Red Slim",
+                ]
+            ],
+        )
+        self.product_variant_service.create(
+            product=self.product,
+            variant_options_data=[
+                {"name": "Size", "values": ["S", "M"]},
+                {"name": "Color", "values": ["Dark blue", "Red", "Dark"]},
+                {"name": "Fit", "values": ["Slim", "Regular"]},
+            ],
+        )
+
+        self.assertEqual(
+            list(self._get_variants().values_list("name", flat=True)),
+            ["Size Color Fit - S Red Slim"],
+        )
+
+    def test_lazy_regeneration_only_checks_materialized_variants(self):
+        self.product_variant_service.set_product_variants_data(
+            product=self.product,
+            product_variants_data=[
+                {"name": name, "sku": name, "cost": "1.00", "price": "2.00"}
+                for name in [
+                    "Size Color Fit - S Red Slim",
+                    "Size Color Fit - L Red Slim",
+                ]
+            ],
+        )
+        variant_id = self._get_variants().get(sku="Size Color Fit - S Red Slim").id
+        color = VariantOption.objects.get(product=self.product, name="Color")
+
+        with mock.patch.object(
+            VariantMatrix, "get_combinations", side_effect=AssertionError
+        ):
+            self.product_variant_service.create(
+                product=self.product,
+                variant_options_data=[
+                    {"name": "Size", "values": ["S", "M"]},
+                    {
+                        "uuid": color.uuid,
+                        "name": "Colour",
+                        "values": ["Dark blue", "Red", "Dark"],
+                    },
+                    {"name": "Fit", "values": ["Slim", "Regular"]},
+                ],
+            )
+
+        product_variant = self._get_variants().get()
+        self.assertEqual(product_variant.id, variant_id)
+        self.assertEqual(product_variant.name, "Size Colour Fit - S Red Slim")
+
+    def test_variant_summary_describes_the_whole_matrix(self):
+        self.product_variant_service.set_product_variants_data(
+            product=self.product,
+            product_variants_data=[
+                {
+                    "name": "Size Color Fit - L Dark blue Slim",
+                    "sku": "SKU-L",
+                    "cost": "5.00",
+                    "price": "9.90",
+                }
+            ],
+        )
+
+        response = self.client.get(
+            reverse("product-detail", kwargs={"uuid": self.product.uuid})
+        )
+
+        self.assertEqual(
+            response.data["variant_summary"],
+            {
+                "count": 18,
+                "materialized_count": 1,
+                "min_price": 0,
+                "max_price": Decimal("9.90"),
+                "is_lazy": True,
+            },
+        )
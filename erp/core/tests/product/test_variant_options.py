@@ -0,0 +1,56 @@
+from core.models import VariantOption, VariantValue
+from core.services import ProductVariantService
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class VariantOptionsTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.product = self._create_product()
+        self.variant_options_data = [
+            {"name": "Color", "values": ["Red", "Blue", "Green"]},
+            {"name": "Size", "values": ["S", "M", "L", "XL"]},
+            {"name": "Material", "values": ["Cotton", "Wool"]},
+        ]
+
+    def _get_values(self, *, option_name):
+        return set(
+            VariantValue.objects.filter(
+                product=self.product, option__name=option_name
+            ).values_list("value", flat=True)
+        )
+
+    def test_create_variants_runs_constant_queries(self):
+        with self.assertNumQueries(5):
+            ProductVariantService().create_variants(
+                product=self.product, variant_options_data=self.variant_options_data
+            )
+
+        self.assertEqual(VariantOption.objects.filter(product=self.product).count(), 3)
+        self.assertEqual(VariantValue.objects.filter(product=self.product).count(), 9)
+        self.assertEqual(self._get_values(option_name="Size"), {"S", "M", "L", "XL"})
+
+    def test_create_variants_prunes_removed_options_and_values(self):
+        product_variant_service = ProductVariantService()
+        product_variant_service.create_variants(
+            product=self.product, variant_options_data=self.variant_options_data
+        )
+        color = VariantOption.objects.get(product=self.product, name="Color")
+
+        product_variant_service.create_variants(
+            product=self.product,
+            variant_options_data=[
+                {"name": "Color", "values": ["Red", "Black"]},
+                {"name": "Size", "values": ["S", "M", "L", "XL"]},
+            ],
+        )
+
+        self.assertEqual(
+            VariantOption.objects.get(product=self.product, name="Color").pk, color.pk
+        )
+        self.assertFalse(
+            VariantOption.objects.filter(product=self.product, name="Material").exists()
+        )
+        self.assertEqual(self._get_values(option_name="Color"), {"Red", "Black"})
+        self.assertEqual(self._get_values(option_name="Material"), set())
+        self.assertEqual(VariantValue.objects.filter(product=self.product).count(), 6)
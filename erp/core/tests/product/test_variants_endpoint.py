@@ -0,0 +1,86 @@
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from core.models import ProductVariant
+from core.services import ProductVariantService
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class ProductVariantsEndpointTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.product = self._create_product()
+        ProductVariantService().create(
+            product=self.product,
+            variant_options_data=[
+                {"name": "Color", "values": ["Red", "Blue", "Green"]},
+                {"name": "Size", "values": ["S", "M", "L", "XL"]},
+            ],
+        )
+        for price, product_variant in enumerate(
+            ProductVariant.objects.filter(product=self.product).order_by("id"), 1
+        ):
+            product_variant.sku = f"SKU-{price}"
+            product_variant.price = price
+            product_variant.save()
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+            HTTP_X_COMPANY_UUID=self.company.uuid,
+        )
+        self.url = reverse(
+            "product-variants-list", kwargs={"product_uuid": self.product.uuid}
+        )
+
+    def test_variants_are_cursor_paginated(self):
+        response = self.client.get(self.url, {"page_size": 5})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertNotIn("count", response.data)
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_variants_filter_by_option_value_and_price(self):
+        response = self.client.get(
+            self.url, {"option_value": "blue", "min_price": 5, "max_price": 7}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(row["name"] for row in response.data["results"]),
+            ["Color Size - Blue L", "Color Size - Blue M", "Color Size - Blue S"],
+        )
+
+    def test_variants_filter_by_sku(self):
+        response = self.client.get(self.url, {"sku": "SKU-3"})
+
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["price"], "3.00")
+
+    def test_variants_of_unknown_product_are_not_found(self):
+        url = reverse(
+            "product-variants-list",
+            kwargs={"product_uuid": "00000000-0000-0000-0000-000000000000"},
+        )
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_product_detail_embeds_variant_summary(self):
+        url = reverse("product-detail", kwargs={"uuid": self.product.uuid})
+        response = self.client.get(url)
+
+        self.assertNotIn("product_variants", response.data)
+        self.assertEqual(
+            response.data["variant_summary"],
+            {"count": 12, "min_price": 1, "max_price": 12, "is_lazy": False},
+        )
+
+    def test_malformed_product_uuid_is_not_found(self):
+        response = self.client.get(
+            reverse("product-variants-list", kwargs={"product_uuid": "not-a-uuid"})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
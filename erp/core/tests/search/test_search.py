@@ -0,0 +1,74 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from core.models import Brand, Partner, Product
+from core.tests.base_api_test_case import BaseAPITestCase
+
+
+class SearchTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.brand = Brand.objects.create(company=self.company, name="Kumadrill")
+        self.products = [
+            self._create_product(name="Cordless drill", sku="DR-100"),
+            self._create_product(name="Drill bit set", sku="BT-200"),
+            self._create_product(name="Hammer", sku="HM-300", brand=self.brand),
+            self._create_product(name="Screwdriver", sku="SD-400"),
+        ]
+
+    def _search(self, *, url, data):
+        response = self._make_get_request(url=url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["name"] for item in response.data["results"]]
+
+    def test_product_search_matches_name_sku_and_brand_ranked(self):
+        names = self._search(url=reverse("product-list"), data={"q": "drill"})
+
+        self.assertEqual(set(names), {"Cordless drill", "Drill bit set", "Hammer"})
+        self.assertEqual(names[-1], "Hammer", "Expected brand-only match last")
+
+        names = self._search(url=reverse("product-list"), data={"q": "sd-4"})
+        self.assertEqual(names, ["Screwdriver"])
+
+    def test_product_search_resolves_brand_ids_first(self):
+        Brand.objects.create(company=self.other_company, name="Otherdrill")
+        self._search(url=reverse("product-list"), data={"q": "drill"})
+
+        with CaptureQueriesContext(connection) as context:
+            names = self._search(url=reverse("product-list"), data={"q": "drill"})
+
+        self.assertIn("Hammer", names)
+        product_queries = [
+            query["sql"]
+            for query in context
+            if 'UPPER("core_product"."name"' in query["sql"]
+        ]
+        self.assertTrue(product_queries)
+        for sql in product_queries:
+            self.assertIn(f'"core_product"."brand_id" IN ({self.brand.id})', sql)
+            self.assertNotIn('UPPER("core_brand"."name"', sql)
+
+    def test_product_search_keeps_field_filters(self):
+        names = self._search(
+            url=reverse("product-list"), data={"q": "drill", "brand_name": "kuma"}
+        )
+        self.assertEqual(names, ["Hammer"])
+
+    def test_partner_search_matches_email_and_tax_id(self):
+        Partner.objects.create(
+            company=self.company, name="Acme", email="sales@acme.test", tax_id="B123"
+        )
+        Partner.objects.create(company=self.company, name="Globex", tax_id="A999")
+
+        url = reverse("partner-list")
+        self.assertEqual(self._search(url=url, data={"q": "acme.test"}), ["Acme"])
+        self.assertEqual(self._search(url=url, data={"q": "a99"}), ["Globex"])
+
+    def test_icontains_filters_can_use_trigram_indexes(self):
+        queryset = Product.objects.filter(name__icontains="drill")
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("product_name_trgm_idx", plan)
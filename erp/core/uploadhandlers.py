@@ -0,0 +1,23 @@
+import hashlib
+
+from django.core.files.uploadhandler import FileUploadHandler
+
+
+class ContentHashUploadHandler(FileUploadHandler):
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.content_hashes = {}
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.content_hashes.setdefault(self.field_name, []).append(
+            self.hasher.hexdigest()
+        )
+        return None
@@ -1,24 +1,36 @@
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from core.routers import BulkRouter
 from core.views import (
     BrandViewSet,
     CategoryViewSet,
     CompanyViewSet,
+    ImageUploadViewSet,
     ImageViewSet,
+    MediaView,
     PartnerViewSet,
     ProductViewSet,
+    ProductVariantViewSet,
     UnitOfMeasureViewSet,
 )
 
-router = DefaultRouter()
+router = BulkRouter()
 router.register(r"companies", CompanyViewSet)
 router.register(r"partners", PartnerViewSet)
 router.register(r"categories", CategoryViewSet)
 router.register(r"brands", BrandViewSet)
 router.register(r"units-of-measure", UnitOfMeasureViewSet)
 router.register(r"products", ProductViewSet)
+router.register(
+    r"products/(?P<product_uuid>[^/.]+)/variants",
+    ProductVariantViewSet,
+    basename="product-variants",
+)
 router.register(r"upload/images", ImageViewSet, basename="upload-images")
+router.register(
+    r"upload/image-chunks", ImageUploadViewSet, basename="upload-image-chunks"
+)
 
 urlpatterns = [
     path("", include(router.urls)),
+    path("media/<path:name>", MediaView.as_view(), name="media"),
 ]
@@ -1,27 +1,69 @@
-from rest_framework import viewsets, mixins, status
+import io
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models import Prefetch
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.http import http_date
+from rest_framework import viewsets, mixins, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.views import APIView
 
-from core.mixins import BaseModelViewSet
+from core.mixins import BaseModelViewSet, ExportMixin
+from core.pagination import BaseCursorPagination, CountStrategy
 from core.filters import (
     BrandFilter,
     CategoryFilter,
     PartnerFilter,
     ProductFilter,
+    ProductVariantFilter,
     UnitOfMeasureFilter,
 )
-from core.models import Brand, Category, Company, Partner, Product, UnitOfMeasure
+from core.models import (
+    Brand,
+    Category,
+    Company,
+    ImageUpload,
+    Partner,
+    Product,
+    ProductImage,
+    ProductVariant,
+    UnitOfMeasure,
+)
 from core.serializers import (
     BrandSerializer,
     CategorySerializer,
     CompanySerializer,
     ImageSerializer,
+    ImageUploadSerializer,
     PartnerSerializer,
+    ProductImportFileSerializer,
+    ProductImportSerializer,
     ProductSerializer,
     ProductListSerializer,
+    ProductVariantListSerializer,
+    ProductVariantMatrixSerializer,
     UnitOfMeasureSerializer,
 )
-from core.services import CategoryService, CompanyService, ProductService, UtilService
+from core.services import (
+    CategoryService,
+    CompanyService,
+    ImageDerivativeService,
+    ImageService,
+    ImageUploadService,
+    ProductImportService,
+    ProductService,
+    ProductVariantService,
+)
+from core.uploadhandlers import ContentHashUploadHandler
 
 
 class CompanyViewSet(BaseModelViewSet):
@@ -29,7 +71,7 @@ class CompanyViewSet(BaseModelViewSet):
     serializer_class = CompanySerializer
 
     def get_queryset(self):
-        return Company.objects.filter(user=self.request.user)
+        return Company.objects.filter(user_id=self.request.user.pk)
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -65,10 +107,12 @@ class CompanyViewSet(BaseModelViewSet):
         )
 
 
-class PartnerViewSet(BaseModelViewSet):
+class PartnerViewSet(ExportMixin, BaseModelViewSet):
     queryset = Partner.objects.all().order_by("-id")
     serializer_class = PartnerSerializer
+    allow_bulk = True
     filterset_class = PartnerFilter
+    count_strategy = CountStrategy.CACHED
 
 
 class CategoryViewSet(BaseModelViewSet):
@@ -101,33 +145,64 @@ class CategoryViewSet(BaseModelViewSet):
 class BrandViewSet(BaseModelViewSet):
     queryset = Brand.objects.all().order_by("-id")
     serializer_class = BrandSerializer
+    allow_bulk = True
     filterset_class = BrandFilter
 
 
 class UnitOfMeasureViewSet(BaseModelViewSet):
     queryset = UnitOfMeasure.objects.all().order_by("-id")
     serializer_class = UnitOfMeasureSerializer
+    allow_bulk = True
     filterset_class = UnitOfMeasureFilter
 
 
-class ProductViewSet(BaseModelViewSet):
+class ProductViewSet(ExportMixin, BaseModelViewSet):
     queryset = Product.objects.all().order_by("-id")
     serializer_class = ProductSerializer
     filterset_class = ProductFilter
+    count_strategy = CountStrategy.CACHED
+    detail_prefetch = [
+        "variant_options__variant_values",
+        Prefetch(
+            "product_images",
+            queryset=ProductImage.objects.select_related("image"),
+        ),
+    ]
+
+    list_prefetch = [
+        Prefetch(
+            "product_images",
+            queryset=ProductImage.objects.filter(
+                product_variant__isnull=True
+            ).select_related("image"),
+        ),
+    ]
 
     def get_serializer_class(self):
-        if self.action == "list":
+        if self.action in ["list", "export"]:
             return ProductListSerializer
         return ProductSerializer
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        return queryset.select_related("brand", "unit_of_measure")
+        queryset = queryset.select_related("brand", "unit_of_measure")
+        if self.action == "retrieve":
+            return queryset.prefetch_related(*self.detail_prefetch)
+        if self.action in ["list", "export"]:
+            return queryset.prefetch_related(*self.list_prefetch)
+        return queryset
+
+    def get_detail_instance(self, *, product):
+        queryset = self.get_queryset().prefetch_related(*self.detail_prefetch)
+        return queryset.get(pk=product.pk)
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         product_service = ProductService()
-        product_service.create(company=self.get_company(), serializer=serializer)
+        product = product_service.create(
+            company=self.get_company(), serializer=serializer
+        )
+        serializer.instance = self.get_detail_instance(product=product)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -137,24 +212,274 @@ class ProductViewSet(BaseModelViewSet):
             instance, data=request.data, partial=kwargs.get("partial", False)
         )
         product_service = ProductService()
-        product_service.update(serializer=serializer)
+        product = product_service.update(serializer=serializer)
+        serializer.instance = self.get_detail_instance(product=product)
 
         return Response(serializer.data)
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        url_name="import",
+        parser_classes=[MultiPartParser],
+    )
+    def import_products(self, request, *args, **kwargs):
+        serializer = ProductImportFileSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        file = serializer.validated_data["file"]
+        rows = ProductImportService.read_rows(
+            file=io.TextIOWrapper(file.file, encoding="utf-8", newline=""),
+            file_format=serializer.validated_data["file_format"],
+        )
+        product_import_service = ProductImportService()
+        result = product_import_service.import_rows(
+            company=self.get_company(), serializer=ProductImportSerializer(), rows=rows
+        )
+
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"], url_path="variant-matrix")
+    def variant_matrix(self, request, *args, **kwargs):
+        product = self.get_object()
+        product_variant_service = ProductVariantService()
+        variant_matrix = product_variant_service.get_variant_matrix(product=product)
+
+        paginator = self.pagination_class()
+        combinations = paginator.paginate_queryset(variant_matrix, request, view=self)
+        rows = product_variant_service.get_variant_matrix_rows(
+            product=product, variant_matrix=variant_matrix, combinations=combinations
+        )
+        serializer = ProductVariantMatrixSerializer(rows, many=True)
+
+        return paginator.get_paginated_response(serializer.data)
+
+
+class ProductVariantViewSet(BaseModelViewSet):
+    """
+    Lists the stored variants of a product. Lazy products only store the
+    combinations that were edited; their full matrix is served by the
+    product's variant-matrix action.
+    """
+
+    queryset = ProductVariant.objects.all()
+    serializer_class = ProductVariantListSerializer
+    filterset_class = ProductVariantFilter
+    pagination_class = BaseCursorPagination
+    cursor_pagination_class = None
+    cursor_ordering_fields = ["id", "price", "created", "modified"]
+    http_method_names = ["get", "head", "options"]
+
+    def get_product(self):
+        return get_object_or_404(
+            Product, company=self.get_company(), uuid=self.kwargs["product_uuid"]
+        )
+
+    def get_queryset(self):
+        return self.queryset.filter(product=self.get_product())
+
 
 class ImageViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
+    permission_classes = [permissions.IsAuthenticated]
     parser_classes = (MultiPartParser, FormParser)
     serializer_class = ImageSerializer
 
     def create(self, request, *args, **kwargs):
+        content_hash_handler = ContentHashUploadHandler(request)
+        request.upload_handlers.insert(0, content_hash_handler)
+        company = CompanyService.get_for_user(
+            user=request.user, company_uuid=request.headers.get("X-Company-UUID")
+        )
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
 
-        company_uuid = self.request.headers.get("X-Company-UUID")
+        content_hashes = content_hash_handler.content_hashes.get("url", [None])
+        image, created = ImageService.create(
+            company=company, serializer=serializer, content_hash=content_hashes[0]
+        )
+        serializer = self.get_serializer(image)
+        if not created:
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        ImageDerivativeService.schedule(image=image)
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["post"])
+    def batch(self, request, *args, **kwargs):
+        content_hash_handler = ContentHashUploadHandler(request)
+        request.upload_handlers.insert(0, content_hash_handler)
+        files = request.FILES.getlist("files")
+        if not files:
+            raise ValidationError({"files": ["No files were submitted."]})
+        if len(files) > settings.IMAGE_BATCH_UPLOAD_MAX_FILES:
+            raise ValidationError(
+                {
+                    "files": [
+                        f"At most {settings.IMAGE_BATCH_UPLOAD_MAX_FILES} files can "
+                        "be uploaded at once."
+                    ]
+                }
+            )
+
+        company = CompanyService.get_for_user(
+            user=request.user, company_uuid=request.headers.get("X-Company-UUID")
+        )
+
+        results, errors = ImageService.bulk_create(
+            company=company,
+            serializer=self.get_serializer(),
+            files=files,
+            content_hashes=content_hash_handler.content_hashes["files"],
+        )
+        for _, image, created in results:
+            if created:
+                ImageDerivativeService.schedule(image=image)
+
+        serializer = self.get_serializer()
+        return Response(
+            {
+                "results": [
+                    {
+                        "index": index,
+                        "created": created,
+                        "image": serializer.to_representation(image),
+                    }
+                    for index, image, created in results
+                ],
+                "errors": errors,
+            },
+            status=status.HTTP_207_MULTI_STATUS if errors else status.HTTP_201_CREATED,
+        )
+
+
+class ImageUploadViewSet(BaseModelViewSet):
+    queryset = ImageUpload.objects.all().order_by("-id")
+    serializer_class = ImageUploadSerializer
+    http_method_names = ["get", "post", "put", "head", "options"]
+    offset_header = "Upload-Offset"
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        ImageUploadService.create(company=self.get_company(), serializer=serializer)
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def update(self, request, *args, **kwargs):
+        image_upload = self.get_object()
+        try:
+            offset = int(request.headers.get(self.offset_header, ""))
+        except ValueError:
+            raise ValidationError(
+                {"detail": f"The {self.offset_header} header must be an integer."}
+            )
+
+        image_upload = ImageUploadService.write_chunk(
+            image_upload=image_upload, offset=offset, stream=request.stream
+        )
+        serializer = self.get_serializer(image_upload)
 
-        validated_data = serializer.validated_data
-        validated_data["company"] = UtilService.validate_uuid(company_uuid, Company)
+        return Response(serializer.data)
 
-        serializer.save()
+    @action(detail=True, methods=["post"])
+    def finalize(self, request, *args, **kwargs):
+        image_upload = self.get_object()
+        if image_upload.image_id is None:
+            with ImageUploadService.open_file(image_upload=image_upload) as file:
+                serializer = ImageSerializer(data={"url": file})
+                image, created = ImageUploadService.finalize(
+                    image_upload=image_upload, serializer=serializer
+                )
+            if created:
+                ImageDerivativeService.schedule(image=image)
+
+        serializer = ImageSerializer(image_upload.image)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class MediaView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    immutable_cache_control = "private, max-age=31536000, immutable"
+    cache_control = "private, no-cache"
+    chunk_size = 64 * 1024
+
+    def get(self, request, name):
+        company = CompanyService.get_for_user(
+            user=request.user, company_uuid=request.headers.get("X-Company-UUID")
+        )
+        image = ImageService.get_by_name(company=company, name=name)
+        path = default_storage.path(name)
+        if image is None or not os.path.isfile(path):
+            raise Http404
+
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        response = self.get_file_response(
+            request=request, name=name, path=path, content_type=content_type
+        )
+
+        is_content_hashed = image.content_hash and os.path.basename(name).startswith(
+            image.content_hash
+        )
+        response["Cache-Control"] = (
+            self.immutable_cache_control if is_content_hashed else self.cache_control
+        )
+        response["Last-Modified"] = http_date(os.path.getmtime(path))
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+    def get_file_response(self, *, request, name, path, content_type):
+        if settings.MEDIA_SERVE_BACKEND == "x-accel-redirect":
+            response = HttpResponse(content_type=content_type)
+            response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(
+                name
+            )
+            return response
+        if settings.MEDIA_SERVE_BACKEND == "x-sendfile":
+            response = HttpResponse(content_type=content_type)
+            response["X-Sendfile"] = os.path.abspath(path)
+            return response
+
+        size = os.path.getsize(path)
+        byte_range = self.get_byte_range(header=request.headers.get("Range"), size=size)
+        if byte_range is None:
+            return FileResponse(open(path, "rb"), content_type=content_type)
+
+        start, end = byte_range
+        if start > end:
+            response = HttpResponse(
+                status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+            )
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        response = StreamingHttpResponse(
+            self.read_range(path=path, start=start, end=end),
+            status=status.HTTP_206_PARTIAL_CONTENT,
+            content_type=content_type,
+        )
+        response["Content-Length"] = end - start + 1
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return response
+
+    def get_byte_range(self, *, header, size):
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", (header or "").strip())
+        if match is None or match.groups() == ("", ""):
+            return None
+
+        start, end = match.groups()
+        if start == "":
+            suffix_length = int(end)
+            return max(size - suffix_length, 0), size - 1 if suffix_length else -1
+        return int(start), min(int(end or size - 1), size - 1)
+
+    def read_range(self, *, path, start, end):
+        with open(path, "rb") as file:
+            file.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "django_extensions",
     "authentication",
     "core",
@@ -141,10 +142,13 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Products whose option combinations exceed this size keep their variants virtual
+PRODUCT_VARIANTS_LAZY_THRESHOLD = 5000
+
 # Configuración de JWT
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "authentication.backend.ClaimsJWTAuthentication",
     ),
 }
 
@@ -154,10 +158,27 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
+JWT_REVOCATION_CACHE_TIMEOUT = 60
 
-MEDIA_URL = "/media/"
+# Media is only served through the authenticated, tenant-scoped core MediaView
+MEDIA_URL = "/api/core/media/"
 MEDIA_ROOT = "media/"
 
+IMAGE_DERIVATIVES = {
+    "thumbnail": {"size": [200, 200], "format": "JPEG", "quality": 80},
+    "medium": {"size": [800, 800], "format": "JPEG", "quality": 85},
+    "webp": {"size": [1600, 1600], "format": "WEBP", "quality": 80},
+}
+IMAGE_DERIVATIVE_WORKERS = 2
+IMAGE_BATCH_UPLOAD_WORKERS = 4
+IMAGE_BATCH_UPLOAD_MAX_FILES = 50
+
+# "x-accel-redirect" (nginx) or "x-sendfile" (Apache); empty serves files from Django.
+# MEDIA_ROOT must not be exposed publicly: with nginx, map it only to an internal
+# location, e.g. `location /protected-media/ { internal; alias /srv/erp/media/; }`.
+MEDIA_SERVE_BACKEND = os.getenv("MEDIA_SERVE_BACKEND", "")
+MEDIA_ACCEL_REDIRECT_PREFIX = "/protected-media/"
+
 AUTH_USER_MODEL = "authentication.CustomUser"
 
 AUTHENTICATION_BACKENDS = ["authentication.backend.EmailBackend"]